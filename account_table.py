@@ -0,0 +1,308 @@
+"""account_table.py
+
+Columnar storage for very many accounts.
+
+Every oop.Account is a Python object with an instance __dict__ holding id,
+balance, payment_amt and deposit_amt, a few hundred bytes per account.
+AccountTable stores the same four fields as contiguous NumPy columns (32
+bytes per account, plus 16 for the sorted index that keeps ids unique and
+serves lookups) and computes get_balance for every account in one
+vectorized pass. table[account_id] returns an AccountView, a small object
+with the Account attributes and methods that reads and writes the columns.
+
+Run this file to compare memory per account and balance computation time
+with the object-per-account model.
+"""
+
+from typing import Dict, Iterable
+import time
+import tracemalloc
+
+import numpy as np
+
+from oop import Account
+
+_MIN_CAPACITY = 16
+_PENDING_MIN = 1 << 12  # pending new ids before a merge into the index
+
+
+class AccountView:
+    """Account-compatible view of one row of an AccountTable."""
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: "AccountTable", row: int):
+        self._table = table
+        self._row = row
+
+    @property
+    def id(self) -> int:
+        return int(self._table.ids[self._row])
+
+    @property
+    def balance(self) -> float:
+        return self._table.balance[self._row].item()
+
+    @balance.setter
+    def balance(self, value: float) -> None:
+        self._table.balance[self._row] = value
+
+    @property
+    def payment_amt(self) -> float:
+        return self._table.payment_amt[self._row].item()
+
+    @payment_amt.setter
+    def payment_amt(self, value: float) -> None:
+        self._table.payment_amt[self._row] = value
+
+    @property
+    def deposit_amt(self) -> float:
+        return self._table.deposit_amt[self._row].item()
+
+    @deposit_amt.setter
+    def deposit_amt(self, value: float) -> None:
+        self._table.deposit_amt[self._row] = value
+
+    def deposit(self, amount: float) -> None:
+        self._table.deposit_amt[self._row] += amount
+
+    def withdraw(self, amount: float) -> None:
+        self._table.payment_amt[self._row] += amount
+
+    def get_balance(self) -> float:
+        t, r = self._table, self._row
+        return (t.balance[r] + t.deposit_amt[r] - t.payment_amt[r]).item()
+
+    def __repr__(self) -> str:
+        return f"AccountView(id={self.id}, balance={self.get_balance()})"
+
+
+class AccountTable:
+    """
+    id, balance, payment_amt and deposit_amt as NumPy columns. Rows are
+    appended with add/add_many; ids are unique and looked up through a
+    sorted index. New ids wait in a small dict of pending rows and are
+    merged into the index in bulk once there are enough of them.
+    """
+
+    def __init__(self, capacity: int = _MIN_CAPACITY, dtype=np.float64):
+        capacity = max(capacity, _MIN_CAPACITY)
+        self._n = 0
+        self._ids = np.empty(capacity, dtype=np.int64)
+        self._balance = np.empty(capacity, dtype=dtype)
+        self._payment = np.empty(capacity, dtype=dtype)
+        self._deposit = np.empty(capacity, dtype=dtype)
+        self._order = np.empty(0, dtype=np.intp)  # argsort of ids[:_indexed]
+        self._sorted_ids = np.empty(0, dtype=np.int64)  # ids[_order]
+        self._indexed = 0
+        self._pending: Dict[int, int] = {}  # id -> row, rows _indexed.._n
+
+    # Column views over the used rows only.
+    @property
+    def ids(self) -> np.ndarray:
+        return self._ids[:self._n]
+
+    @property
+    def balance(self) -> np.ndarray:
+        return self._balance[:self._n]
+
+    @property
+    def payment_amt(self) -> np.ndarray:
+        return self._payment[:self._n]
+
+    @property
+    def deposit_amt(self) -> np.ndarray:
+        return self._deposit[:self._n]
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def nbytes(self) -> int:
+        return (self._ids.nbytes + self._balance.nbytes
+                + self._payment.nbytes + self._deposit.nbytes)
+
+    def _reserve(self, extra: int) -> None:
+        need = self._n + extra
+        capacity = len(self._ids)
+        if need <= capacity:
+            return
+        while capacity < need:
+            capacity *= 2
+        for name in ("_ids", "_balance", "_payment", "_deposit"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._n] = old[:self._n]
+            setattr(self, name, new)
+
+    def _pending_limit(self) -> int:
+        # Merging costs O(n), so let the pending rows grow with the table.
+        return max(_PENDING_MIN, self._indexed // 8)
+
+    def _merge_pending(self) -> None:
+        """Merge the pending rows into the sorted index."""
+        if self._indexed == self._n:
+            return
+        new_ids = self._ids[self._indexed:self._n]
+        by_id = np.argsort(new_ids, kind="stable")
+        new_sorted = new_ids[by_id]
+        pos = np.searchsorted(self._sorted_ids, new_sorted)
+        self._order = np.insert(self._order, pos, self._indexed + by_id)
+        self._sorted_ids = np.insert(self._sorted_ids, pos, new_sorted)
+        self._indexed = self._n
+        self._pending.clear()
+
+    def _indexed_ids(self, ids: np.ndarray) -> np.ndarray:
+        """The ids (sorted, unique) that are already in the sorted index."""
+        sorted_ids = self._sorted_ids
+        pos = np.searchsorted(sorted_ids, ids)
+        hit = pos < len(sorted_ids)
+        return ids[hit][sorted_ids[pos[hit]] == ids[hit]]
+
+    def add(self, account_id: int, balance: float) -> AccountView:
+        """Append one account; ValueError if the id is already present."""
+        account_id = int(account_id)
+        sorted_ids = self._sorted_ids
+        i = sorted_ids.searchsorted(account_id)
+        if account_id in self._pending or (
+                i < len(sorted_ids) and sorted_ids[i] == account_id):
+            raise ValueError(f"account id {account_id} already exists")
+        self._reserve(1)
+        row = self._n
+        self._ids[row] = account_id
+        self._balance[row] = balance
+        self._payment[row] = self._deposit[row] = 0
+        self._n += 1
+        self._pending[account_id] = row
+        if len(self._pending) > self._pending_limit():
+            self._merge_pending()
+        return AccountView(self, row)
+
+    def add_many(self, ids: Iterable[int], balances: Iterable[float]) -> None:
+        """Append accounts; ValueError if an id is repeated or present."""
+        ids = np.asarray(ids, dtype=np.int64).reshape(-1)
+        balances = np.asarray(balances, dtype=self._balance.dtype)
+        if ids.shape != balances.shape:
+            raise ValueError("ids and balances must have the same length")
+        k = len(ids)
+        if k == 0:
+            return
+        new_ids, counts = np.unique(ids, return_counts=True)
+        if len(new_ids) < k:
+            raise ValueError(f"duplicate account id {new_ids[counts > 1][0]}")
+        if k > self._pending_limit():
+            self._merge_pending()  # so only the sorted index needs checking
+        elif self._pending:
+            clash = self._pending.keys() & set(ids.tolist())
+            if clash:
+                raise ValueError(f"account id {min(clash)} already exists")
+        taken = self._indexed_ids(new_ids)
+        if len(taken):
+            raise ValueError(f"account id {taken[0]} already exists")
+        self._reserve(k)
+        start, end = self._n, self._n + k
+        self._ids[start:end] = ids
+        self._balance[start:end] = balances
+        self._payment[start:end] = 0
+        self._deposit[start:end] = 0
+        self._n = end
+        if len(self._pending) + k > self._pending_limit():
+            self._merge_pending()
+        else:
+            self._pending.update(zip(ids.tolist(), range(start, end)))
+
+    @classmethod
+    def from_accounts(cls, accounts: Iterable[Account]) -> "AccountTable":
+        accounts = list(accounts)
+        table = cls(len(accounts))
+        table.add_many([a.id for a in accounts], [a.balance for a in accounts])
+        table.payment_amt[:] = [a.payment_amt for a in accounts]
+        table.deposit_amt[:] = [a.deposit_amt for a in accounts]
+        return table
+
+    def rows(self, account_ids: Iterable[int]) -> np.ndarray:
+        """Row numbers of account_ids; KeyError if any id is unknown."""
+        keys = np.asarray(account_ids, dtype=np.int64).reshape(-1)
+        sorted_ids = self._sorted_ids
+        if len(sorted_ids):
+            pos = np.minimum(np.searchsorted(sorted_ids, keys),
+                             len(sorted_ids) - 1)
+            out = self._order[pos]
+            missed = np.flatnonzero(sorted_ids[pos] != keys)
+        else:
+            out = np.zeros(len(keys), dtype=np.intp)
+            missed = np.arange(len(keys))
+        if len(missed):
+            pending = self._pending
+            for j, key in zip(missed.tolist(), keys[missed].tolist()):
+                row = pending.get(key)
+                if row is None:
+                    raise KeyError(key)
+                out[j] = row
+        return out
+
+    def __getitem__(self, account_id: int) -> AccountView:
+        return AccountView(self, int(self.rows([account_id])[0]))
+
+    def __contains__(self, account_id: int) -> bool:
+        try:
+            self.rows([account_id])
+        except KeyError:
+            return False
+        return True
+
+    def deposit_many(self, account_ids: Iterable[int],
+                     amounts: Iterable[float]) -> None:
+        """Vectorized deposit; repeated ids accumulate (np.add.at)."""
+        np.add.at(self._deposit, self.rows(account_ids), amounts)
+
+    def withdraw_many(self, account_ids: Iterable[int],
+                      amounts: Iterable[float]) -> None:
+        np.add.at(self._payment, self.rows(account_ids), amounts)
+
+    def get_balances(self) -> np.ndarray:
+        """get_balance() of every account, in row order."""
+        return self.balance + self.deposit_amt - self.payment_amt
+
+
+def benchmark(n: int = 1_000_000) -> None:
+    print(f"--- account table benchmark: {n} accounts ---")
+    ids = range(n)
+
+    tracemalloc.start()
+    accounts = [Account(i, i % 1000) for i in ids]
+    obj_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    for a in accounts[::3]:
+        a.deposit(5)
+
+    tracemalloc.start()
+    table = AccountTable(n)
+    table.add_many(np.arange(n), np.arange(n) % 1000)
+    table_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    table.deposit_many(np.arange(0, n, 3), np.full(len(range(0, n, 3)), 5.0))
+
+    start = time.perf_counter()
+    obj_balances = [a.get_balance() for a in accounts]
+    t_obj = time.perf_counter() - start
+    start = time.perf_counter()
+    table_balances = table.get_balances()
+    t_table = time.perf_counter() - start
+    assert np.array_equal(table_balances, obj_balances)
+
+    print(f"Account objects  {obj_bytes / n:8.1f} bytes/account  "
+          f"get_balance for all {t_obj:8.4f}s")
+    print(f"AccountTable     {table_bytes / n:8.1f} bytes/account  "
+          f"get_balances        {t_table:8.4f}s  ({t_obj / t_table:.0f}x)")
+
+
+if __name__ == "__main__":
+    table = AccountTable()
+    table.add(1, 100)
+    account = table.add(2, 200)
+    account.deposit(50)
+    table[1].withdraw(30)
+    print("Balances:", table.get_balances())  # [ 70. 250.]
+    print("Account 2:", table[2], "balance", table[2].get_balance())
+    benchmark()
@@ -0,0 +1,176 @@
+"""blocked_matmul.py
+
+Out-of-core, tiled and multithreaded matrix multiply.
+
+numpy_test.py multiplies small in-memory arrays with np.matmul. For
+operands stored on disk and bigger than RAM, matmul_files maps both .npy
+files with np.memmap, computes the result one output tile at a time and
+writes each tile into a memory-mapped .npy result. Only a few tiles per
+worker are held in memory at once.
+
+Each output tile C[i, j] = sum over k of A[i, k] @ B[k, j] is an
+independent task; np.matmul releases the GIL, so a thread pool runs tiles in
+parallel. The BLAS library may itself be multithreaded: when using several
+workers, limiting it to one thread (e.g. OPENBLAS_NUM_THREADS=1) avoids
+oversubscription.
+
+Run this file to compare with plain np.matmul.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+import math
+import os
+import resource
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+_FALLBACK_CACHE_BYTES = 1 << 20
+_MIN_TILE = 64
+
+
+def cache_bytes() -> int:
+    """Size of the L2 cache, or 1 MiB where it cannot be determined."""
+    try:
+        size = os.sysconf("SC_LEVEL2_CACHE_SIZE")
+    except (ValueError, OSError, AttributeError):
+        size = 0
+    return size if size > 0 else _FALLBACK_CACHE_BYTES
+
+
+def default_tile(dtype=np.float64) -> int:
+    """Edge of a square tile such that an A, B and C tile fit in L2."""
+    itemsize = np.dtype(dtype).itemsize
+    edge = int(math.sqrt(cache_bytes() / (3 * itemsize)))
+    return max(_MIN_TILE, edge // _MIN_TILE * _MIN_TILE)
+
+
+def blocked_matmul(a: np.ndarray, b: np.ndarray,
+                   out: Optional[np.ndarray] = None,
+                   tile: Optional[int] = None,
+                   workers: Optional[int] = None) -> np.ndarray:
+    """
+    a @ b computed tile by tile into out (allocated if None). a, b and out
+    may be np.memmap objects; each task reads only the tiles it needs.
+    """
+    if a.ndim != 2 or b.ndim != 2 or a.shape[1] != b.shape[0]:
+        raise ValueError(f"cannot multiply shapes {a.shape} and {b.shape}")
+    n, m = a.shape[0], b.shape[1]
+    depth = a.shape[1]
+    dtype = np.result_type(a.dtype, b.dtype)
+    if out is None:
+        out = np.empty((n, m), dtype=dtype)
+    elif out.shape != (n, m):
+        raise ValueError(f"out has shape {out.shape}, expected {(n, m)}")
+    tile = tile or default_tile(dtype)
+    workers = workers or os.cpu_count() or 1
+
+    def compute(ij: Tuple[int, int]) -> None:
+        i, j = ij
+        i_end, j_end = min(i + tile, n), min(j + tile, m)
+        acc = np.zeros((i_end - i, j_end - j), dtype=dtype)
+        for k in range(0, depth, tile):
+            k_end = min(k + tile, depth)
+            acc += np.asarray(a[i:i_end, k:k_end]) @ np.asarray(b[k:k_end, j:j_end])
+        out[i:i_end, j:j_end] = acc
+
+    tiles = [(i, j) for i in range(0, n, tile) for j in range(0, m, tile)]
+    if workers == 1:
+        for ij in tiles:
+            compute(ij)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(compute, tiles))
+    return out
+
+
+def matmul_files(a_path: str, b_path: str, out_path: str,
+                 tile: Optional[int] = None,
+                 workers: Optional[int] = None) -> np.ndarray:
+    """
+    Multiply the matrices stored in the .npy files a_path and b_path and
+    write the product to out_path. Returns the result as a read-only memmap.
+    """
+    a = np.load(a_path, mmap_mode="r")
+    b = np.load(b_path, mmap_mode="r")
+    out = np.lib.format.open_memmap(out_path, mode="w+",
+                                    dtype=np.result_type(a.dtype, b.dtype),
+                                    shape=(a.shape[0], b.shape[1]))
+    blocked_matmul(a, b, out, tile=tile, workers=workers)
+    out.flush()
+    del out
+    return np.load(out_path, mmap_mode="r")
+
+
+def _write_random(path: str, n: int, seed: int, rows: int = 256) -> None:
+    """Write a random n x n float64 .npy file without holding it in RAM."""
+    rng = np.random.default_rng(seed)
+    arr = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64,
+                                    shape=(n, n))
+    for r in range(0, n, rows):
+        arr[r:r + rows] = rng.random((min(rows, n - r), n))
+    arr.flush()
+
+
+def _measure(args) -> Tuple[float, int, int]:
+    """One run in a fresh process: seconds, traced peak bytes, max RSS KiB."""
+    name, a_path, b_path, out_path, tile, workers = args
+    tracemalloc.start()
+    start = time.perf_counter()
+    if name == "np.matmul":
+        np.save(out_path, np.matmul(np.load(a_path), np.load(b_path)))
+    else:
+        matmul_files(a_path, b_path, out_path, tile=tile, workers=workers)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def benchmark(n: int = 4096, tile: Optional[int] = None,
+              workers: Optional[int] = None,
+              include_in_memory: bool = True) -> None:
+    """
+    Multiply two n x n float64 matrices from disk. Choose n so that
+    3 * n * n * 8 bytes exceeds RAM to test the out-of-core case (and set
+    include_in_memory=False, since np.matmul would then fail). Peak heap is
+    NumPy allocations seen by tracemalloc; max RSS also counts mapped file
+    pages, which the kernel can drop at any time.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    tile = tile or default_tile()
+    workers = workers or os.cpu_count() or 1
+    print(f"--- blocked matmul benchmark: {n}x{n}, tile {tile}, "
+          f"{workers} workers ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        a_path, b_path = os.path.join(tmp, "a.npy"), os.path.join(tmp, "b.npy")
+        _write_random(a_path, n, 0)
+        _write_random(b_path, n, 1)
+        names = (["np.matmul"] if include_in_memory else []) + ["blocked"]
+        results = {}
+        for name in names:
+            out_path = os.path.join(tmp, f"{name}.npy")
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                elapsed, peak, rss = pool.submit(
+                    _measure, (name, a_path, b_path, out_path, tile,
+                               workers)).result()
+            results[name] = out_path
+            gflops = 2 * n ** 3 / elapsed / 1e9
+            print(f"{name:10s} {elapsed:8.2f}s  {gflops:7.2f} GFLOP/s  "
+                  f"peak heap {peak / 2**20:9.1f} MiB  max RSS {rss / 1024:9.1f} MiB")
+        if include_in_memory:
+            ref = np.load(results["np.matmul"], mmap_mode="r")
+            got = np.load(results["blocked"], mmap_mode="r")
+            assert np.allclose(ref, got)
+
+
+if __name__ == "__main__":
+    a = np.full((3, 2), 3)
+    b = np.ones((2, 3))
+    print(blocked_matmul(a, b, tile=1))
+    print(blocked_matmul(b, a, tile=1))
+    benchmark(n=2048)
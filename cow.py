@@ -0,0 +1,415 @@
+"""cow.py
+
+Copy-on-write list and dict with O(1) snapshots.
+
+data_structure.demo_mutability_and_copying and
+list_test.advanced_list_techniques copy with list.copy() and
+copy.deepcopy(). Both are O(n), and deepcopy of a large nested structure is
+slow. CowList and CowDict store their items in fixed-size chunks (a list is
+cut into runs of CHUNK_SIZE items, a dict into hash shards), so that
+snapshot() can share every chunk with the original and return at once.
+
+Ownership is tracked with tokens: each container has a token, and each
+chunk records the token of the container allowed to write it. snapshot()
+gives both sides fresh tokens, so neither owns anything; the first write to
+a chunk then copies just that chunk (plus the spine, the list of chunk
+pointers, which is CHUNK_SIZE times smaller than the data).
+
+Nested CowList / CowDict values make snapshots deep: when a chunk is copied,
+the containers in it are snapshotted too (O(1) each), so changing
+snap[2][0] never shows through in the original, as with deepcopy. Each
+nested container remembers its home (parent and key). A write through a
+reference obtained before a snapshot first makes the home copy the shared
+chunk (all the way up the tree); the home keeps the live child and the
+chunk left to the snapshot gets a frozen copy of it. Other mutable values
+(plain lists, objects) are shared, as with list.copy().
+freeze converts nested lists and dicts; thaw converts back.
+
+Run this file to benchmark snapshot + mutate against deepcopy.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import copy
+import time
+import tracemalloc
+
+CHUNK_SIZE = 256
+_MIN_SHARDS = 8
+
+
+class _Cow:
+    """Chunk ownership shared by CowList and CowDict."""
+
+    def __init__(self):
+        self._token = object()
+        self._chunks: List[Any] = []
+        self._owners: List[object] = []
+        self._spine_owner: Optional[object] = self._token
+        self._nested = False  # may contain CowList / CowDict values
+        self._home: Optional[Tuple["_Cow", Any]] = None  # (parent, key)
+
+    def _share(self, other: "_Cow") -> None:
+        """Make other a snapshot of self; neither owns any chunk afterwards."""
+        other._chunks = self._chunks
+        other._owners = self._owners
+        other._nested = self._nested
+        other._home = None
+        self._token = object()
+        other._token = object()
+        self._spine_owner = other._spine_owner = None
+
+    def _claim(self) -> None:
+        """
+        Before a write: if the parent chunk holding self may be shared with
+        a snapshot, have the parent take its own copy first (recursively).
+        """
+        if self._home is None:
+            return
+        parent, key = self._home
+        i, slot = parent._locate(key)
+        try:
+            held = parent._chunks[i][slot]
+        except (IndexError, KeyError):
+            held = None
+        if held is not self:  # replaced or removed since
+            self._home = None
+            return
+        parent._own(i)
+
+    def _child_copy(self, old: Any, slot: Any, key: Any, value: Any) -> Any:
+        """
+        value for self's copy of the shared chunk old. A child whose home is
+        this slot stays live here and old gets a frozen copy of it; any
+        other child is snapshotted for self.
+        """
+        if not isinstance(value, _Cow):
+            return value
+        if value._home is not None and value._home[0] is self \
+                and value._home[1] == key:
+            old[slot] = value.snapshot()
+            return value
+        copy_ = value.snapshot()
+        copy_._home = (self, key)
+        return copy_
+
+    def _own(self, i: int) -> Any:
+        """Chunk i, copied first unless this container already owns it."""
+        self._claim()
+        if self._spine_owner is not self._token:
+            self._chunks = list(self._chunks)
+            self._owners = list(self._owners)
+            self._spine_owner = self._token
+        if self._owners[i] is self._token:
+            return self._chunks[i]
+        chunk = self._copy_chunk(i, self._chunks[i])
+        self._chunks[i] = chunk
+        self._owners[i] = self._token
+        return chunk
+
+    def _readable(self, i: int) -> Any:
+        """
+        Chunk i for reading. A chunk holding nested containers that is still
+        shared is copied, since the caller may go on to mutate a child.
+        """
+        if self._nested and self._owners[i] is not self._token:
+            return self._own(i)
+        return self._chunks[i]
+
+    def _adopt(self, value: Any, key: Any) -> Any:
+        if isinstance(value, _Cow):
+            self._nested = True
+            value._home = (self, key)
+        return value
+
+    def copy(self):
+        """
+        Same as snapshot() (defined by each subclass, along with
+        _copy_chunk and _locate), so code written for list.copy() keeps working.
+        """
+        return self.snapshot()
+
+    __copy__ = copy
+
+
+class CowList(_Cow):
+    """A list with O(1) snapshot(). Items live in chunks of CHUNK_SIZE."""
+
+    def __init__(self, items: Iterable[Any] = ()):
+        super().__init__()
+        self._len = 0
+        self.extend(items)
+
+    def _copy_chunk(self, i: int, chunk: List[Any]) -> List[Any]:
+        if self._nested:
+            base = i * CHUNK_SIZE
+            return [self._child_copy(chunk, j, base + j, v)
+                    for j, v in enumerate(chunk)]
+        return list(chunk)
+
+    def _locate(self, i: int) -> Tuple[int, int]:
+        return divmod(i, CHUNK_SIZE)
+
+    def snapshot(self) -> "CowList":
+        other = CowList.__new__(CowList)
+        self._share(other)
+        other._len = self._len
+        return other
+
+    def __len__(self) -> int:
+        return self._len
+
+    def _index(self, i: int) -> int:
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError("CowList index out of range")
+        return i
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return CowList(self[j] for j in range(*i.indices(self._len)))
+        i = self._index(i)
+        return self._readable(i // CHUNK_SIZE)[i % CHUNK_SIZE]
+
+    def __setitem__(self, i: int, value: Any) -> None:
+        i = self._index(i)
+        self._own(i // CHUNK_SIZE)[i % CHUNK_SIZE] = self._adopt(value, i)
+
+    def append(self, value: Any) -> None:
+        self._adopt(value, self._len)
+        if self._len % CHUNK_SIZE == 0:
+            self._claim()
+            if self._spine_owner is not self._token:
+                self._chunks = list(self._chunks)
+                self._owners = list(self._owners)
+                self._spine_owner = self._token
+            self._chunks.append([value])
+            self._owners.append(self._token)
+        else:
+            self._own(len(self._chunks) - 1).append(value)
+        self._len += 1
+
+    def extend(self, items: Iterable[Any]) -> None:
+        for value in items:
+            self.append(value)
+
+    def pop(self) -> Any:
+        if not self._len:
+            raise IndexError("pop from empty CowList")
+        last = len(self._chunks) - 1
+        value = self._own(last).pop()
+        if not self._chunks[last]:
+            self._chunks.pop()
+            self._owners.pop()
+        self._len -= 1
+        return value
+
+    def __iter__(self) -> Iterator[Any]:
+        for i in range(len(self._chunks)):
+            yield from self._readable(i)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (CowList, list)):
+            return len(self) == len(other) and all(
+                a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"CowList({thaw(self)!r})"
+
+
+class CowDict(_Cow):
+    """
+    A dict with O(1) snapshot(). Keys are spread over hash shards of about
+    CHUNK_SIZE keys; iteration goes shard by shard, not in insertion order.
+    """
+
+    def __init__(self, items: Any = ()):
+        super().__init__()
+        self._len = 0
+        self._reset(_MIN_SHARDS)
+        pairs = items.items() if hasattr(items, "items") else items
+        for key, value in pairs:
+            self[key] = value
+
+    def _reset(self, shards: int) -> None:
+        self._chunks = [{} for _ in range(shards)]
+        self._owners = [self._token] * shards
+        self._spine_owner = self._token
+
+    def _copy_chunk(self, i: int, chunk: Dict[Any, Any]) -> Dict[Any, Any]:
+        if self._nested:
+            return {k: self._child_copy(chunk, k, k, v)
+                    for k, v in list(chunk.items())}
+        return dict(chunk)
+
+    def _locate(self, key: Any) -> Tuple[int, Any]:
+        return self._shard(key), key
+
+    def snapshot(self) -> "CowDict":
+        other = CowDict.__new__(CowDict)
+        self._share(other)
+        other._len = self._len
+        return other
+
+    def _shard(self, key: Any) -> int:
+        return hash(key) % len(self._chunks)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._readable(self._shard(key))[key]
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        return self._readable(self._shard(key)).get(key, default)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._chunks[self._shard(key)]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        shard = self._own(self._shard(key))
+        if key not in shard:
+            self._len += 1
+        shard[key] = self._adopt(value, key)
+        if self._len > CHUNK_SIZE * len(self._chunks):
+            self._grow()
+
+    def __delitem__(self, key: Any) -> None:
+        del self._own(self._shard(key))[key]
+        self._len -= 1
+
+    def _grow(self) -> None:
+        """Double the shard count; O(n), amortized over the inserts."""
+        items = list(self.items())
+        self._reset(2 * len(self._chunks))
+        for key, value in items:
+            self._chunks[self._shard(key)][key] = value
+
+    def items(self) -> Iterator[Tuple[Any, Any]]:
+        for i in range(len(self._chunks)):
+            yield from self._readable(i).items()
+
+    def __iter__(self) -> Iterator[Any]:
+        for key, _ in self.items():
+            yield key
+
+    keys = __iter__
+
+    def values(self) -> Iterator[Any]:
+        for _, value in self.items():
+            yield value
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (CowDict, dict)):
+            return len(self) == len(other) and all(
+                k in other and other[k] == v for k, v in self.items())
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"CowDict({thaw(self)!r})"
+
+
+def freeze(obj: Any) -> Any:
+    """Nested lists and dicts as CowList / CowDict."""
+    if isinstance(obj, list):
+        return CowList(freeze(v) for v in obj)
+    if isinstance(obj, dict):
+        return CowDict((k, freeze(v)) for k, v in obj.items())
+    return obj
+
+
+def thaw(obj: Any) -> Any:
+    """Nested CowList / CowDict as plain lists and dicts."""
+    if isinstance(obj, CowList):
+        return [thaw(v) for v in obj]
+    if isinstance(obj, CowDict):
+        return {k: thaw(v) for k, v in obj.items()}
+    return obj
+
+
+def _traced(fn) -> Tuple[Any, float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, size
+
+
+def benchmark(rows: int = 1000, cols: int = 1000, snapshots: int = 100) -> None:
+    """
+    Take snapshots of a rows x cols nested list, changing one element after
+    each. Memory is what the snapshots keep alive (tracemalloc).
+    """
+    n = rows * cols
+    print(f"--- snapshot benchmark: {rows}x{cols} nested list "
+          f"({n:,} elements), {snapshots} snapshots ---")
+    data = [list(range(r * cols, (r + 1) * cols)) for r in range(rows)]
+    start = time.perf_counter()
+    frozen = freeze(data)
+    print(f"freeze (once)           {time.perf_counter() - start:8.3f}s")
+
+    def deepcopies(k: int):
+        snaps = []
+        for i in range(k):
+            snap = copy.deepcopy(data)
+            snap[i % rows][i % cols] = -1
+            snaps.append(snap)
+        return snaps
+
+    def cow_snapshots(k: int):
+        snaps = []
+        for i in range(k):
+            snap = frozen.snapshot()
+            snap[i % rows][i % cols] = -1
+            snaps.append(snap)
+        return snaps
+
+    n_deep = max(1, min(snapshots, 5))  # deepcopy is too slow for more
+    for name, fn, k in [("deepcopy + mutate", deepcopies, n_deep),
+                        ("CowList snapshot + mutate", cow_snapshots, snapshots)]:
+        snaps, elapsed, size = _traced(lambda: fn(k))
+        assert snaps[-1][(k - 1) % rows][(k - 1) % cols] == -1
+        print(f"{name:26s} {elapsed / k * 1e3:10.3f} ms/snapshot  "
+              f"{size / k / 2**20:9.3f} MiB/snapshot")
+    assert frozen[0][0] == data[0][0] == 0
+
+
+if __name__ == "__main__":
+    original = CowList([1, 2, 3])
+    alias = original
+    alias.append(4)
+    print("original after alias.append:", original)
+    assert original is alias
+
+    shallow = original.snapshot()
+    shallow.append(5)
+    print("original after snapshot.append:", original)
+    print("snapshot:", shallow)
+    assert shallow is not original and original == [1, 2, 3, 4]
+
+    original = freeze([1, 2, [3, 4]])
+    deep = original.snapshot()
+    deep[2][0] = 999
+    print(f"Original after snapshot modification: {original}")
+    assert thaw(original) == [1, 2, [3, 4]]
+
+    config = freeze({"name": "demo", "tags": ["a", "b"]})
+    snap = config.snapshot()
+    snap["tags"].append("c")
+    print("config:", config, "snapshot:", snap)
+
+    # Writes through references taken before a snapshot stay out of it.
+    outer = freeze([[1, 2]])
+    child = outer[0]
+    snap = outer.snapshot()
+    child[0] = 99
+    assert thaw(snap) == [[1, 2]] and thaw(outer) == [[99, 2]]
+    d = freeze({"a": [1, 2]})
+    tags = d["a"]
+    s = d.snapshot()
+    tags.append(3)
+    assert thaw(s) == {"a": [1, 2]} and thaw(d) == {"a": [1, 2, 3]}
+    benchmark()
@@ -0,0 +1,294 @@
+"""grid_paths.py
+
+Shortest paths on large cost grids.
+
+iteration.matrix_test builds an INF-filled distance grid as a list of lists
+and iteration.heapq_test pops (value, key) pairs from a heap: the two parts
+of Dijkstra on a grid. Here the grid is a NumPy float64 array of per-cell
+entry costs (np.inf marks a wall) and the distances are a flat float64
+array, with cells encoded as flat indices r * width + c, so a heap entry is
+a (distance, index) pair of a float and an int rather than a tuple holding
+a (row, col) tuple. The Python loop reads and writes the arrays through
+memoryviews, which is much cheaper than NumPy scalar indexing, and the
+grid is padded with a border of walls so neighbours need no bounds checks.
+
+Entries are never removed from the heap when a cell gets a shorter
+distance; a popped entry whose distance is larger than the recorded one is
+stale and skipped (lazy deletion).
+
+- dijkstra: distances from one or more sources, optionally stopping at a
+  target, and the parent of each cell for path reconstruction.
+- astar: one target, guided by the Manhattan distance times the cheapest
+  cell cost (an admissible heuristic, so the path is still optimal).
+- multi_source_bfs: unit weights, expanded a whole frontier at a time with
+  NumPy, so there is no per-cell Python work at all.
+
+Run this file to benchmark against a list-of-lists + tuple-heap version.
+"""
+
+from collections import deque
+from typing import Iterable, List, Optional, Tuple
+import heapq
+import time
+
+import numpy as np
+
+INF = float("inf")
+Cell = Tuple[int, int]
+
+
+def _flat(cells: Iterable[Cell], shape: Tuple[int, int]) -> List[int]:
+    rows, cols = shape
+    out = []
+    for r, c in cells:
+        if not (0 <= r < rows and 0 <= c < cols):
+            raise IndexError(f"cell {(r, c)} is outside the {rows}x{cols} grid")
+        out.append(r * cols + c)
+    return out
+
+
+def _padded(cost: np.ndarray) -> np.ndarray:
+    """
+    cost with a one-cell border of walls, flattened. Every real cell then
+    has four neighbours at -w, +w, -1 and +1 (w = cols + 2), and stepping
+    into the border costs INF, so the search loop needs no bounds checks.
+    """
+    rows, cols = cost.shape
+    out = np.full((rows + 2, cols + 2), INF)
+    out[1:-1, 1:-1] = cost
+    return out.ravel()
+
+
+def _to_padded(i: int, cols: int) -> int:
+    r, c = divmod(i, cols)
+    return (r + 1) * (cols + 2) + c + 1
+
+
+def _unpad(dist: np.ndarray, parent: np.ndarray, rows: int, cols: int
+           ) -> Tuple[np.ndarray, np.ndarray]:
+    w = cols + 2
+    dist = dist.reshape(rows + 2, w)[1:-1, 1:-1].copy()
+    parent = parent.reshape(rows + 2, w)[1:-1, 1:-1]
+    pr, pc = np.divmod(parent, w)
+    parent = np.where(parent >= 0, (pr - 1) * cols + pc - 1, -1)
+    return dist, parent
+
+
+def dijkstra(cost: np.ndarray, sources: Iterable[Cell],
+             target: Optional[Cell] = None
+             ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cheapest distance from the nearest source to every cell, where a step
+    into a cell costs cost[cell] (sources start at 0). Returns the
+    distances (INF where unreachable) and the flat index of each cell's
+    parent (-1 for sources and unreached cells). With a target the search
+    stops once the target's distance is final.
+    """
+    rows, cols = cost.shape
+    w = cols + 2
+    cost_flat = _padded(cost)
+    dist = np.full(len(cost_flat), INF)
+    parent = np.full(len(cost_flat), -1, dtype=np.int64)
+    cv, dv, pv = memoryview(cost_flat), memoryview(dist), memoryview(parent)
+    heap = []
+    for s in _flat(sources, cost.shape):
+        s = _to_padded(s, cols)
+        dv[s] = 0.0
+        heap.append((0.0, s))
+    heapq.heapify(heap)
+    goal = -1
+    if target is not None:
+        goal = _to_padded(_flat([target], cost.shape)[0], cols)
+    pop, push = heapq.heappop, heapq.heappush
+    while heap:
+        du, u = pop(heap)
+        if du > dv[u]:
+            continue  # stale entry
+        if u == goal:
+            break
+        for v in (u - w, u + w, u - 1, u + 1):
+            nd = du + cv[v]
+            if nd < dv[v]:
+                dv[v] = nd
+                pv[v] = u
+                push(heap, (nd, v))
+    return _unpad(dist, parent, rows, cols)
+
+
+def astar(cost: np.ndarray, source: Cell, target: Cell
+          ) -> Tuple[float, List[Cell]]:
+    """Distance and path (source to target) of a cheapest route, A*."""
+    rows, cols = cost.shape
+    w = cols + 2
+    cost_flat = _padded(cost)
+    finite = cost_flat[np.isfinite(cost_flat)]
+    scale = float(finite.min()) if finite.size else 0.0
+    dist = np.full(len(cost_flat), INF)
+    parent = np.full(len(cost_flat), -1, dtype=np.int64)
+    cv, dv, pv = memoryview(cost_flat), memoryview(dist), memoryview(parent)
+    s, goal = (_to_padded(i, cols) for i in _flat([source, target], cost.shape))
+    gr, gc = divmod(goal, w)
+    dv[s] = 0.0
+    heap = [(0.0, 0.0, s)]
+    pop, push = heapq.heappop, heapq.heappush
+    while heap:
+        _, du, u = pop(heap)
+        if du > dv[u]:
+            continue  # stale entry
+        if u == goal:
+            _, parent = _unpad(dist, parent, rows, cols)
+            return du, path(parent, target)
+        for v in (u - w, u + w, u - 1, u + 1):
+            nd = du + cv[v]
+            if nd < dv[v]:
+                dv[v] = nd
+                pv[v] = u
+                vr, vc = divmod(v, w)
+                h = (abs(vr - gr) + abs(vc - gc)) * scale
+                push(heap, (nd + h, nd, v))
+    return INF, []
+
+
+def path(parent: np.ndarray, target: Cell) -> List[Cell]:
+    """Cells from the source to target, following a parent array."""
+    cols = parent.shape[1]
+    flat = parent.ravel()
+    u = target[0] * cols + target[1]
+    out = []
+    while u >= 0:
+        out.append(divmod(u, cols))
+        u = int(flat[u])
+    out.reverse()
+    return out
+
+
+def multi_source_bfs(passable: np.ndarray,
+                     sources: Iterable[Cell]) -> np.ndarray:
+    """
+    Number of steps from the nearest source to every passable cell (INF
+    where unreachable), one vectorized frontier per step.
+    """
+    rows, cols = passable.shape
+    n = rows * cols
+    open_ = np.ascontiguousarray(passable, dtype=bool).ravel()
+    dist = np.full(n, INF)
+    frontier = np.unique(np.array(_flat(sources, passable.shape),
+                                  dtype=np.int64))
+    dist[frontier] = 0.0
+    step = 0
+    while frontier.size:
+        step += 1
+        c = frontier % cols
+        cand = np.concatenate((frontier[frontier >= cols] - cols,
+                               frontier[frontier < n - cols] + cols,
+                               frontier[c > 0] - 1,
+                               frontier[c < cols - 1] + 1))
+        cand = cand[open_[cand] & (dist[cand] == INF)]
+        frontier = np.unique(cand)
+        dist[frontier] = step
+    return dist.reshape(rows, cols)
+
+
+def _baseline_dijkstra(cost: List[List[float]], source: Cell
+                       ) -> List[List[float]]:
+    """matrix_test's INF grid plus heapq_test's tuple heap."""
+    r, c = len(cost), len(cost[0])
+    dist = [[INF] * c for _ in range(r)]
+    sr, sc = source
+    dist[sr][sc] = 0.0
+    heap = [(0.0, (sr, sc))]
+    while heap:
+        d, (i, j) = heapq.heappop(heap)
+        if d > dist[i][j]:
+            continue
+        for di, dj in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+            ni, nj = i + di, j + dj
+            if 0 <= ni < r and 0 <= nj < c:
+                nd = d + cost[ni][nj]
+                if nd < dist[ni][nj]:
+                    dist[ni][nj] = nd
+                    heapq.heappush(heap, (nd, (ni, nj)))
+    return dist
+
+
+def _baseline_bfs(passable: List[List[bool]], sources: List[Cell]
+                  ) -> List[List[float]]:
+    r, c = len(passable), len(passable[0])
+    dist = [[INF] * c for _ in range(r)]
+    queue = deque()
+    for i, j in sources:
+        dist[i][j] = 0
+        queue.append((i, j))
+    while queue:
+        i, j = queue.popleft()
+        for di, dj in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+            ni, nj = i + di, j + dj
+            if (0 <= ni < r and 0 <= nj < c and passable[ni][nj]
+                    and dist[ni][nj] == INF):
+                dist[ni][nj] = dist[i][j] + 1
+                queue.append((ni, nj))
+    return dist
+
+
+def random_grid(rows: int, cols: int, wall_fraction: float = 0.1,
+                seed: int = 0) -> np.ndarray:
+    """Costs in [1, 10) with a fraction of INF walls; corners are open."""
+    rng = np.random.default_rng(seed)
+    cost = rng.uniform(1.0, 10.0, (rows, cols))
+    cost[rng.random((rows, cols)) < wall_fraction] = INF
+    cost[:2, :2] = cost[-2:, -2:] = 1.0
+    return cost
+
+
+def benchmark(side: int = 3163, dijkstra_side: int = 1000) -> None:
+    """
+    Weighted searches on a dijkstra_side^2 grid (Python-level loops on
+    both sides), BFS on a side^2 grid (about 10^7 cells by default).
+    """
+    print(f"--- grid paths benchmark: weighted {dijkstra_side}^2, "
+          f"BFS {side}^2 ---")
+    cost = random_grid(dijkstra_side, dijkstra_side)
+    nested = cost.tolist()
+    target = (dijkstra_side - 1, dijkstra_side - 1)
+    start = time.perf_counter()
+    ref = _baseline_dijkstra(nested, (0, 0))
+    t_base = time.perf_counter() - start
+    print(f"{'baseline dijkstra':24s} {t_base:8.3f}s")
+    start = time.perf_counter()
+    dist, _ = dijkstra(cost, [(0, 0)])
+    elapsed = time.perf_counter() - start
+    assert np.array_equal(dist, np.array(ref))
+    print(f"{'dijkstra':24s} {elapsed:8.3f}s  ({t_base / elapsed:.1f}x)")
+    start = time.perf_counter()
+    d_target, _ = dijkstra(cost, [(0, 0)], target=target)
+    print(f"{'dijkstra to target':24s} {time.perf_counter() - start:8.3f}s")
+    start = time.perf_counter()
+    d_astar, route = astar(cost, (0, 0), target)
+    print(f"{'astar to target':24s} {time.perf_counter() - start:8.3f}s  "
+          f"({len(route)} cells)")
+    assert d_astar == dist[target] == d_target[target]
+
+    passable = np.isfinite(random_grid(side, side))
+    sources = [(0, 0), (side - 1, side - 1)]
+    if side * side <= 4_000_000:
+        start = time.perf_counter()
+        ref = _baseline_bfs(passable.tolist(), sources)
+        t_base = time.perf_counter() - start
+        print(f"{'baseline BFS':24s} {t_base:8.3f}s")
+    start = time.perf_counter()
+    steps = multi_source_bfs(passable, sources)
+    elapsed = time.perf_counter() - start
+    print(f"{'multi_source_bfs':24s} {elapsed:8.3f}s  "
+          f"({side * side / elapsed:,.0f} cells/s)")
+    if side * side <= 4_000_000:
+        assert np.array_equal(steps, np.array(ref))
+
+
+if __name__ == "__main__":
+    grid = np.array([[1, 1, 1], [INF, INF, 1], [1, 1, 1]])
+    dist, parent = dijkstra(grid, [(0, 0)])
+    print(dist)
+    print("path:", path(parent, (2, 0)))
+    print("astar:", astar(grid, (0, 0), (2, 0)))
+    print(multi_source_bfs(np.isfinite(grid), [(0, 0), (2, 0)]))
+    benchmark(side=1000, dijkstra_side=500)
@@ -0,0 +1,163 @@
+"""growable_array.py
+
+Amortized-doubling NumPy row buffer.
+
+numpy_test.py grows a matrix with m1 = np.vstack([m1, m1]). In a loop every
+vstack copies the whole array, so ingesting n rows costs O(n^2). A
+GrowableArray keeps a preallocated buffer and doubles its capacity when it
+runs out, like list.append, so appending n rows copies O(n) data in total.
+view() returns the filled part without copying.
+
+Run this file to benchmark row appends against the vstack loop.
+"""
+
+from typing import Optional, Sequence, Union
+import time
+
+import numpy as np
+
+_MIN_CAPACITY = 16
+
+
+class GrowableArray:
+    """A 2-D array that grows by rows (and columns) in amortized O(1)."""
+
+    def __init__(self, ncols: int, dtype=np.float64,
+                 capacity: int = _MIN_CAPACITY):
+        if ncols < 0:
+            raise ValueError("ncols must be non-negative")
+        self._buf = np.empty((max(capacity, _MIN_CAPACITY), ncols), dtype=dtype)
+        self._n = 0
+        self._ncols = ncols
+
+    @classmethod
+    def from_array(cls, arr: np.ndarray) -> "GrowableArray":
+        arr = np.atleast_2d(arr)
+        g = cls(arr.shape[1], arr.dtype, capacity=2 * len(arr))
+        g.extend_rows(arr)
+        return g
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def shape(self):
+        return self._n, self._ncols
+
+    @property
+    def dtype(self):
+        return self._buf.dtype
+
+    @property
+    def capacity(self) -> int:
+        return self._buf.shape[0]
+
+    def _reserve(self, rows: int, cols: Optional[int] = None) -> None:
+        cols = self._buf.shape[1] if cols is None else cols
+        cap_rows, cap_cols = self._buf.shape
+        if rows <= cap_rows and cols <= cap_cols:
+            return
+        while cap_rows < rows:
+            cap_rows *= 2
+        if cols > cap_cols:
+            cap_cols = max(cols, 2 * cap_cols)
+        new = np.empty((cap_rows, cap_cols), dtype=self._buf.dtype)
+        new[:self._n, :self._ncols] = self._buf[:self._n, :self._ncols]
+        self._buf = new
+
+    def append_row(self, row: Union[Sequence, np.ndarray]) -> None:
+        if self._n == self._buf.shape[0]:
+            self._reserve(self._n + 1)
+        self._buf[self._n, :self._ncols] = row
+        self._n += 1
+
+    def extend_rows(self, rows: Union[Sequence, np.ndarray]) -> None:
+        rows = np.asarray(rows, dtype=self._buf.dtype)
+        if rows.ndim == 1:
+            rows = rows.reshape(1, -1)
+        if rows.shape[1] != self._ncols:
+            raise ValueError(f"expected {self._ncols} columns, "
+                             f"got {rows.shape[1]}")
+        end = self._n + len(rows)
+        self._reserve(end)
+        self._buf[self._n:end, :self._ncols] = rows
+        self._n = end
+
+    def hstack_column(self, column: Union[Sequence, np.ndarray]) -> None:
+        """
+        Append a column (one value per existing row, or a scalar). Column
+        capacity doubles too, so adding columns one by one is amortized.
+        """
+        column = np.asarray(column, dtype=self._buf.dtype)
+        if column.ndim and len(column) != self._n:
+            raise ValueError(f"column has {len(column)} values, "
+                             f"expected {self._n}")
+        self._reserve(self._buf.shape[0], self._ncols + 1)
+        self._buf[:self._n, self._ncols] = column
+        self._ncols += 1
+
+    def view(self) -> np.ndarray:
+        """The filled rows; shares memory until the next reallocation."""
+        return self._buf[:self._n, :self._ncols]
+
+    def to_array(self) -> np.ndarray:
+        """A compact copy, independent of the buffer."""
+        return self.view().copy()
+
+
+def _vstack_loop(rows: np.ndarray) -> np.ndarray:
+    m = rows[:1]
+    for i in range(1, len(rows)):
+        m = np.vstack([m, rows[i]])
+    return m
+
+
+def _growable(rows: np.ndarray) -> np.ndarray:
+    g = GrowableArray(rows.shape[1], rows.dtype)
+    for row in rows:
+        g.append_row(row)
+    return g.view()
+
+
+def _list_then_array(rows: np.ndarray) -> np.ndarray:
+    acc = []
+    for row in rows:
+        acc.append(row)
+    return np.array(acc)
+
+
+def benchmark(sizes: Sequence[int] = (10_000, 100_000, 1_000_000),
+              ncols: int = 3, max_vstack_rows: int = 30_000) -> None:
+    """
+    Append rows one at a time. The vstack loop is quadratic and only runs
+    up to max_vstack_rows. Collecting a list and converting once is also
+    linear, but the data is only usable as an array at the end, while
+    GrowableArray.view() is available (without copying) at any point.
+    """
+    print(f"--- row append benchmark ({ncols} columns) ---")
+    for n in sizes:
+        rows = np.random.default_rng(0).random((n, ncols))
+        cases = [("GrowableArray", _growable),
+                 ("list + np.array", _list_then_array)]
+        if n <= max_vstack_rows:
+            cases.insert(0, ("vstack loop", _vstack_loop))
+        for name, fn in cases:
+            start = time.perf_counter()
+            result = fn(rows)
+            elapsed = time.perf_counter() - start
+            assert np.array_equal(result, rows), name
+            print(f"n={n:>9,} {name:16s} {elapsed:9.3f}s "
+                  f"{n / elapsed:14,.0f} rows/s")
+        if n > max_vstack_rows:
+            print(f"n={n:>9,} {'vstack loop':16s}   skipped (quadratic)")
+
+
+if __name__ == "__main__":
+    g = GrowableArray(3, dtype=np.int64)
+    g.append_row([1, 2, 3])
+    g.append_row([4, 5, 6])
+    g.extend_rows(g.view())  # like m1 = np.vstack([m1, m1])
+    print(g.view())
+    g.hstack_column([7, 8, 9, 10])
+    print(g.view())
+    benchmark()
@@ -0,0 +1,180 @@
+"""histogram.py
+
+Histogram (value -> count) engine with a strategy picked from the data.
+
+data_structure.demo_dict builds the same histogram with
+counts[n] = counts.get(n, 0) + 1 and with defaultdict(int), one element at
+a time in Python. histogram() does the counting in C:
+
+- "bincount": integers whose value range is dense, np.bincount after
+  shifting by the minimum. Lists and tuples of Python ints are converted to
+  one int64 array for this.
+- "unique": other numeric data (wide integer ranges, floats),
+  np.unique(return_counts=True), which sorts. Int lists and tuples that
+  are not dense come here too, reusing the converted array.
+- "counter": any hashable items, collections.Counter.
+- "parallel": any hashable items, split into slices that a process pool
+  counts with Counter; the partial Counters are summed.
+
+All strategies return a Counter with plain Python keys.
+
+Run this file to benchmark the strategies against the demo_dict loops.
+"""
+
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Hashable, Iterable, Optional, Sequence, Tuple
+import os
+import time
+
+import numpy as np
+
+from int_sort import as_int64
+
+BINCOUNT, UNIQUE, COUNTER, PARALLEL = "bincount", "unique", "counter", "parallel"
+STRATEGIES = (BINCOUNT, UNIQUE, COUNTER, PARALLEL)
+# bincount allocates one slot per value in [min, max]; allow that as long as
+# it is not much larger than the input itself.
+DENSE_RANGE_FACTOR = 4
+DENSE_RANGE_MIN = 1 << 16
+PARALLEL_MIN_ITEMS = 1 << 20
+
+
+def _counter_from_arrays(values: np.ndarray, counts: np.ndarray) -> Counter:
+    return Counter(dict(zip(values.tolist(), counts.tolist())))
+
+
+def _bincount(arr: np.ndarray) -> Counter:
+    if arr.size == 0:
+        return Counter()
+    lo = int(arr.min())
+    counts = np.bincount((arr - lo).astype(np.intp, copy=False))
+    values = np.flatnonzero(counts)
+    return _counter_from_arrays(values + lo, counts[values])
+
+
+def _unique(arr: np.ndarray) -> Counter:
+    values, counts = np.unique(arr, return_counts=True)
+    return _counter_from_arrays(values, counts)
+
+
+def _count_slice(items: Sequence[Hashable]) -> Counter:
+    return Counter(items)
+
+
+def _parallel(items: Sequence[Hashable], workers: int) -> Counter:
+    step = -(-len(items) // workers)
+    total = Counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = [items[i:i + step] for i in range(0, len(items), step)]
+        for part in pool.map(_count_slice, parts):
+            total.update(part)
+    return total
+
+
+def _dense(arr: np.ndarray) -> bool:
+    if arr.dtype.kind not in "iub" or not arr.size:
+        return False
+    span = int(arr.max()) - int(arr.min()) + 1
+    return span <= max(DENSE_RANGE_FACTOR * arr.size, DENSE_RANGE_MIN)
+
+
+def choose_strategy(data, workers: int = 1
+                    ) -> Tuple[str, Optional[np.ndarray]]:
+    """
+    The strategy histogram() uses for data when strategy='auto', and for
+    BINCOUNT / UNIQUE the data as an array (a list or tuple of Python ints
+    is converted once here).
+    """
+    arr = data if isinstance(data, np.ndarray) else None
+    if isinstance(data, (list, tuple)):
+        arr = as_int64(data, len(data))
+    if arr is not None:
+        if _dense(arr):
+            return BINCOUNT, arr
+        if arr.dtype.kind in "iubf":
+            return UNIQUE, arr
+    if workers > 1 and hasattr(data, "__len__") and \
+            len(data) >= PARALLEL_MIN_ITEMS:
+        return PARALLEL, None
+    return COUNTER, None
+
+
+def histogram(data: Iterable[Hashable], strategy: str = "auto",
+              workers: Optional[int] = None) -> Counter:
+    """
+    Count occurrences of every item of data. strategy is 'auto' or one of
+    STRATEGIES; workers is the process count for 'parallel' (default: all
+    CPUs).
+    """
+    workers = workers or os.cpu_count() or 1
+    if strategy == "auto":
+        strategy, arr = choose_strategy(data, workers)
+        if arr is not None:
+            data = arr
+    if strategy in (BINCOUNT, UNIQUE):
+        arr = np.asarray(data)
+        if strategy == BINCOUNT:
+            if arr.dtype.kind not in "iub":
+                raise ValueError("bincount needs integer data")
+            return _bincount(arr)
+        return _unique(arr)
+    if strategy == COUNTER:
+        return Counter(data)
+    if strategy == PARALLEL:
+        items = data.tolist() if isinstance(data, np.ndarray) else data
+        if not hasattr(items, "__getitem__"):
+            items = list(items)
+        return _parallel(items, workers)
+    raise ValueError(f"unknown strategy {strategy!r}, expected one of "
+                     f"{STRATEGIES} or 'auto'")
+
+
+def _dict_get_loop(nums):
+    counts = {}
+    for n in nums:
+        counts[n] = counts.get(n, 0) + 1
+    return counts
+
+
+def _defaultdict_loop(nums):
+    counts = defaultdict(int)
+    for n in nums:
+        counts[n] += 1
+    return counts
+
+
+def benchmark(n: int = 10**8, n_keys: int = 1000,
+              workers: Optional[int] = None, seed: int = 0) -> None:
+    """
+    10**8 elements need ~0.8 GB as an int64 array and several GB as a
+    Python list, which the loop baselines and Counter require.
+    """
+    print(f"--- histogram benchmark: {n} elements, {n_keys} distinct ---")
+    arr = np.random.default_rng(seed).integers(0, n_keys, size=n)
+    nums = arr.tolist()
+    rows = [
+        ("counts.get loop", lambda: _dict_get_loop(nums)),
+        ("defaultdict loop", lambda: _defaultdict_loop(nums)),
+        ("bincount (ndarray)", lambda: histogram(arr, BINCOUNT)),
+        ("unique (ndarray)", lambda: histogram(arr, UNIQUE)),
+        ("auto (list)", lambda: histogram(nums)),
+        ("Counter (list)", lambda: histogram(nums, COUNTER)),
+        (f"parallel x{workers or os.cpu_count()} (list)",
+         lambda: histogram(nums, PARALLEL, workers)),
+    ]
+    expected = None
+    for name, fn in rows:
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        expected = expected or dict(result)
+        assert dict(result) == expected, name
+        print(f"{name:22s} {elapsed:8.3f}s  {n / elapsed:14,.0f} items/s")
+
+
+if __name__ == "__main__":
+    nums = [1, 2, 2, 3, 1, 2, 4]
+    print(dict(histogram(nums)))  # {1: 2, 2: 3, 3: 1, 4: 1}
+    print(dict(histogram(np.array(nums))))
+    benchmark(n=10**7)
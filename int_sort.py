@@ -0,0 +1,144 @@
+"""int_sort.py
+
+Integer fast paths for sorting.sort_list and sorting.sort_set.
+
+sorted() compares Python objects one pair at a time. When every value is a
+Python int that fits in 64 bits, the values can be copied into a NumPy array
+once and sorted there:
+
+- COUNTING: for a dense range (max - min + 1 at most DENSE_FACTOR times
+  the number of values), np.bincount counts each value and np.repeat
+  writes them back in order: O(n + range), no comparisons. Sets need no
+  counts at all, only which values occur.
+- RADIX: LSD radix sort of the values (shifted by the minimum) as uint64,
+  16 bits per pass, each pass a stable sort of one digit. Only as many
+  passes as the range needs are made.
+- NUMPY: np.sort of the int64 array.
+
+AUTO takes COUNTING for dense ranges and NUMPY otherwise. On the sweep in
+benchmark, counting only wins while the range is no larger than n (it
+scans the whole counts array), and np.sort (a vectorized introsort) beats
+the LSD passes at every size and range tried, so RADIX is only used when
+asked for. In all cases the copy into and out of NumPy is most of the
+cost. Anything else (small inputs, floats, bools, ints beyond 64 bits)
+goes to sorted(). The result is always the same List[int] that sorted()
+returns.
+
+Run this file for the sweep over size and key range.
+"""
+
+from typing import Iterable, List, Optional
+import random
+import time
+
+import numpy as np
+
+AUTO = "auto"
+COUNTING = "counting"
+RADIX = "radix"
+NUMPY = "numpy"
+BUILTIN = "builtin"
+STRATEGIES = (AUTO, COUNTING, RADIX, NUMPY, BUILTIN)
+
+MIN_SIZE = 1000  # below this, conversion costs more than sorted() saves
+DENSE_FACTOR = 1
+RADIX_BITS = 16
+
+
+def as_int64(values: Iterable[int], n: int) -> Optional[np.ndarray]:
+    """values as int64, or None unless they are all 64-bit Python ints."""
+    if not set(map(type, values)) <= {int}:
+        return None  # floats, bools, ... keep sorted() semantics
+    try:
+        return np.fromiter(values, dtype=np.int64, count=n)
+    except OverflowError:
+        return None
+
+
+def _counting_sort(arr: np.ndarray, lo: int, span: int,
+                   unique: bool) -> np.ndarray:
+    counts = np.bincount(arr - lo, minlength=span)
+    if unique:
+        return np.flatnonzero(counts) + lo
+    return np.repeat(np.arange(lo, lo + span, dtype=np.int64), counts)
+
+
+def _radix_sort(arr: np.ndarray, lo: int, span: int) -> np.ndarray:
+    keys = (arr - lo).astype(np.uint64)  # wraps correctly for any int64 lo
+    mask = np.uint64((1 << RADIX_BITS) - 1)
+    for shift in range(0, max(span - 1, 1).bit_length(), RADIX_BITS):
+        digits = ((keys >> np.uint64(shift)) & mask).astype(np.uint16)
+        keys = keys[np.argsort(digits, kind="stable")]
+    return (keys + np.uint64(lo & ((1 << 64) - 1))).astype(np.int64)
+
+
+def choose_strategy(n: int, span: int) -> str:
+    if span <= DENSE_FACTOR * n:
+        return COUNTING
+    return NUMPY
+
+
+def sort_ints(values: Iterable[int], strategy: str = AUTO,
+              unique: bool = False) -> List[int]:
+    """
+    sorted(values) for integers, through NumPy when it pays off. unique
+    tells that values has no duplicates (e.g. a set).
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"unknown strategy {strategy!r}")
+    if not isinstance(values, (list, tuple, set, frozenset)):
+        values = list(values)
+    n = len(values)
+    if strategy == BUILTIN or (strategy == AUTO and n < MIN_SIZE) or n == 0:
+        return sorted(values)
+    arr = as_int64(values, n)
+    if arr is None:
+        if strategy != AUTO:
+            raise TypeError(f"{strategy} sort needs 64-bit Python ints")
+        return sorted(values)
+    lo, hi = int(arr.min()), int(arr.max())
+    span = hi - lo + 1
+    if strategy == AUTO:
+        strategy = choose_strategy(n, span)
+    if strategy == COUNTING:
+        out = _counting_sort(arr, lo, span, unique)
+    elif strategy == RADIX:
+        out = _radix_sort(arr, lo, span)
+    else:
+        out = np.sort(arr)
+    return out.tolist()
+
+
+def benchmark(sizes=(1_000, 10_000, 100_000, 1_000_000, 10_000_000),
+              spans=(1 << 10, 1 << 20, 1 << 40, 1 << 62), seed: int = 0) -> None:
+    """Seconds per strategy for random ints in [0, span); * is AUTO's pick."""
+    print("--- integer sort sweep (seconds; * = auto) ---")
+    names = [BUILTIN, COUNTING, RADIX, NUMPY]
+    print(f"{'n':>11s} {'range':>8s} " + " ".join(f"{s:>10s}" for s in names))
+    rng = random.Random(seed)
+    for n in sizes:
+        for span in spans:
+            values = [rng.randrange(span) for _ in range(n)]
+            expected = sorted(values)
+            chosen = BUILTIN if n < MIN_SIZE else choose_strategy(n, span)
+            cells = []
+            for name in names:
+                if name == COUNTING and span > 64 * n:
+                    cells.append(f"{'-':>10s}")  # counts array too large
+                    continue
+                start = time.perf_counter()
+                result = sort_ints(values, strategy=name)
+                elapsed = time.perf_counter() - start
+                assert result == expected, name
+                mark = "*" if name == chosen else " "
+                cells.append(f"{elapsed:9.4f}{mark}")
+            print(f"{n:>11,} {'2^' + str(span.bit_length() - 1):>8s} "
+                  + " ".join(cells))
+
+
+if __name__ == "__main__":
+    from sorting import sort_list, sort_set
+
+    print(sort_list([5, 3, 9, 1, 3]), sort_set({42, 7, 19}))
+    print(sort_ints(range(2000, 0, -1))[:5], sort_ints([-3, 2, -7] * 400)[:3])
+    benchmark(sizes=(1_000, 10_000, 100_000, 1_000_000))
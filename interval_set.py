@@ -0,0 +1,192 @@
+"""interval_set.py
+
+Column-oriented intervals for bulk sorting and overlap queries.
+
+sorting.sort_interval sorts lists of [start, end] Python lists with lambda
+keys, building a tuple per element for composite keys. IntervalSet keeps the
+starts and ends in two int64 NumPy columns, sorts them with np.lexsort
+(stable, like list.sort) and answers merge / greedy selection / stabbing
+queries with vectorized passes.
+
+Intervals are closed: [1, 3] and [3, 5] overlap and contain the point 3.
+
+Run this file for the sort_interval orderings and a benchmark against the
+list-of-lists + lambda approach.
+"""
+
+from typing import Iterable, List, Sequence
+import bisect
+import random
+import time
+
+import numpy as np
+
+# Orderings shown in sorting.sort_interval.
+BY_END = "end"                      # key=lambda i: i[1]
+BY_START = "start"                  # key=lambda i: i[0]
+BY_START_END = "start_end"          # key=lambda i: (i[0], i[1])
+BY_END_START_DESC = "end_start_desc"  # key=lambda i: (i[1], -i[0])
+ORDERS = (BY_END, BY_START, BY_START_END, BY_END_START_DESC)
+
+
+class IntervalSet:
+    """A set of closed intervals stored as two int64 columns."""
+
+    def __init__(self, starts: Iterable[int], ends: Iterable[int]):
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.ends = np.asarray(ends, dtype=np.int64)
+        if self.starts.shape != self.ends.shape or self.starts.ndim != 1:
+            raise ValueError("starts and ends must be 1-D and the same length")
+
+    @classmethod
+    def from_list(cls, intervals: Sequence[Sequence[int]]) -> "IntervalSet":
+        arr = np.asarray(intervals, dtype=np.int64).reshape(-1, 2)
+        return cls(arr[:, 0], arr[:, 1])
+
+    def to_list(self) -> List[List[int]]:
+        return np.column_stack((self.starts, self.ends)).tolist()
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __repr__(self) -> str:
+        return f"IntervalSet({self.to_list()})"
+
+    def take(self, idx: np.ndarray) -> "IntervalSet":
+        return IntervalSet(self.starts[idx], self.ends[idx])
+
+    def argsort(self, order: str = BY_START) -> np.ndarray:
+        """Stable sort permutation; order is one of ORDERS."""
+        if order == BY_END:
+            return np.argsort(self.ends, kind="stable")
+        if order == BY_START:
+            return np.argsort(self.starts, kind="stable")
+        if order == BY_START_END:
+            return np.lexsort((self.ends, self.starts))  # last key is primary
+        if order == BY_END_START_DESC:
+            return np.lexsort((-self.starts, self.ends))
+        raise ValueError(f"unknown order {order!r}, expected one of {ORDERS}")
+
+    def sorted(self, order: str = BY_START) -> "IntervalSet":
+        return self.take(self.argsort(order))
+
+    def merge(self) -> "IntervalSet":
+        """Merge overlapping intervals; result is sorted by start."""
+        if len(self) == 0:
+            return IntervalSet([], [])
+        idx = np.argsort(self.starts, kind="stable")
+        starts = self.starts[idx]
+        reach = np.maximum.accumulate(self.ends[idx])
+        # A new group begins where the start lies beyond everything so far.
+        begin = np.flatnonzero(starts[1:] > reach[:-1]) + 1
+        first = np.concatenate(([0], begin))
+        last = np.concatenate((begin - 1, [len(starts) - 1]))
+        return IntervalSet(starts[first], reach[last])
+
+    def max_non_overlapping(self, touching: bool = False) -> np.ndarray:
+        """
+        Indices of a maximum set of pairwise non-overlapping intervals,
+        the classic greedy "sort by end, keep if start > last end".
+        With touching=True intervals that share only an endpoint ([1, 3]
+        and [3, 5]) also count as disjoint, i.e. they are read as
+        half-open.
+
+        The greedy scan is inherently sequential; the sort is done by NumPy
+        and the scan walks plain int lists, with no per-interval tuples.
+        """
+        order = np.argsort(self.ends, kind="stable")
+        starts = self.starts[order].tolist()
+        ends = self.ends[order].tolist()
+        picked: List[int] = []
+        last_end = None
+        for i, (s, e) in enumerate(zip(starts, ends)):
+            if last_end is None or s > last_end or (touching and s == last_end):
+                picked.append(i)
+                last_end = e
+        return order[picked]
+
+    def stab_counts(self, points: Iterable[int]) -> np.ndarray:
+        """For every point, the number of intervals with start <= p <= end."""
+        p = np.asarray(points, dtype=np.int64)
+        starts = np.sort(self.starts)
+        ends = np.sort(self.ends)
+        return (np.searchsorted(starts, p, side="right")
+                - np.searchsorted(ends, p, side="left"))
+
+
+# Pure-Python baselines, written the way sorting.sort_interval does it.
+
+def _py_merge(intervals: List[List[int]]) -> List[List[int]]:
+    out: List[List[int]] = []
+    for s, e in sorted(intervals, key=lambda interval: interval[0]):
+        if out and s <= out[-1][1]:
+            out[-1][1] = max(out[-1][1], e)
+        else:
+            out.append([s, e])
+    return out
+
+
+def _py_max_non_overlapping(intervals: List[List[int]]) -> int:
+    count = 0
+    last_end = None
+    for s, e in sorted(intervals, key=lambda interval: interval[1]):
+        if last_end is None or s > last_end:
+            count += 1
+            last_end = e
+    return count
+
+
+def _py_stab_counts(intervals: List[List[int]], points: List[int]) -> List[int]:
+    starts = sorted(interval[0] for interval in intervals)
+    ends = sorted(interval[1] for interval in intervals)
+    return [bisect.bisect_right(starts, p) - bisect.bisect_left(ends, p)
+            for p in points]
+
+
+def _timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def benchmark(n: int = 1_000_000, seed: int = 0) -> None:
+    print(f"--- interval benchmark: {n} intervals ---")
+    rng = random.Random(seed)
+    intervals = []
+    for _ in range(n):
+        s = rng.randrange(n * 10)
+        intervals.append([s, s + rng.randrange(1, 50)])
+    points = [rng.randrange(n * 10) for _ in range(n)]
+    iset = IntervalSet.from_list(intervals)
+    keys = {
+        BY_END: lambda interval: interval[1],
+        BY_START: lambda interval: interval[0],
+        BY_START_END: lambda interval: (interval[0], interval[1]),
+        BY_END_START_DESC: lambda interval: (interval[1], -interval[0]),
+    }
+    rows = [(f"sort {order}", lambda k=keys[order]: sorted(intervals, key=k),
+             lambda o=order: iset.argsort(o)) for order in ORDERS]
+    rows += [
+        ("merge", lambda: _py_merge(intervals), iset.merge),
+        ("max non-overlapping", lambda: _py_max_non_overlapping(intervals),
+         iset.max_non_overlapping),
+        ("stab counts", lambda: _py_stab_counts(intervals, points),
+         lambda: iset.stab_counts(points)),
+    ]
+    for name, py_fn, np_fn in rows:
+        t_py = _timed(py_fn)
+        t_np = _timed(np_fn)
+        print(f"{name:22s} list+lambda {t_py:8.3f}s  IntervalSet {t_np:8.3f}s"
+              f"  {t_py / t_np:6.1f}x")
+
+
+if __name__ == "__main__":
+    iset = IntervalSet.from_list([[1, 3], [2, 1], [1, 2]])
+    print("original intervals:", iset.to_list())
+    for order in ORDERS:
+        print(f"sorted by {order}:", iset.sorted(order).to_list())
+    busy = IntervalSet.from_list([[1, 3], [2, 6], [8, 10], [15, 18], [17, 20]])
+    print("merged:", busy.merge().to_list())
+    print("max non-overlapping:", busy.take(busy.max_non_overlapping()).to_list())
+    print("stab counts at 2, 9, 17:", busy.stab_counts([2, 9, 17]).tolist())
+    benchmark(n=200_000)
@@ -0,0 +1,180 @@
+"""ledger.py
+
+Thread-safe account ledger with lock striping and batched posting.
+
+oop.Account updates deposit_amt / payment_amt with +=, which is a
+read-modify-write that can lose updates when several threads post to the
+same account, and every transaction costs a Python method call. Ledger keeps
+the same three numbers per account (balance, deposit_amt, payment_amt) but
+guards them with a fixed number of stripe locks: account ids hash to a
+stripe, so writers to different stripes never contend and there is no
+global lock. post_batch groups a batch of (account_id, amount, kind) tuples
+by stripe and applies each group under a single lock acquisition.
+
+Run this file for a multi-threaded throughput benchmark.
+"""
+
+from threading import Lock, Thread
+from typing import Dict, Iterable, List, Sequence, Tuple
+import random
+import time
+
+DEPOSIT = "deposit"
+WITHDRAW = "withdraw"
+KINDS = (DEPOSIT, WITHDRAW)
+DEFAULT_STRIPES = 64
+
+# Per-account record layout, a list so it can be updated in place.
+_BALANCE, _DEPOSIT, _PAYMENT = 0, 1, 2
+
+Posting = Tuple[int, float, str]
+
+
+class Ledger:
+    """Accounts keyed by id, each guarded by the lock of its stripe."""
+
+    def __init__(self, n_stripes: int = DEFAULT_STRIPES):
+        if n_stripes <= 0:
+            raise ValueError("n_stripes must be positive")
+        self.n_stripes = n_stripes
+        self._locks = [Lock() for _ in range(n_stripes)]
+        self._stripes: List[Dict[int, List[float]]] = [
+            {} for _ in range(n_stripes)]
+
+    def _stripe(self, account_id: int) -> int:
+        return hash(account_id) % self.n_stripes
+
+    def open_account(self, account_id: int, balance: float = 0) -> None:
+        s = self._stripe(account_id)
+        with self._locks[s]:
+            if account_id in self._stripes[s]:
+                raise ValueError(f"account {account_id} already exists")
+            self._stripes[s][account_id] = [balance, 0, 0]
+
+    def __contains__(self, account_id: int) -> bool:
+        return account_id in self._stripes[self._stripe(account_id)]
+
+    def __len__(self) -> int:
+        return sum(len(accounts) for accounts in self._stripes)
+
+    def deposit(self, account_id: int, amount: float) -> None:
+        s = self._stripe(account_id)
+        with self._locks[s]:
+            self._stripes[s][account_id][_DEPOSIT] += amount
+
+    def withdraw(self, account_id: int, amount: float) -> None:
+        s = self._stripe(account_id)
+        with self._locks[s]:
+            self._stripes[s][account_id][_PAYMENT] += amount
+
+    def get_balance(self, account_id: int) -> float:
+        """balance + deposit_amt - payment_amt, as in Account.get_balance."""
+        s = self._stripe(account_id)
+        with self._locks[s]:
+            balance, deposit_amt, payment_amt = self._stripes[s][account_id]
+        return balance + deposit_amt - payment_amt
+
+    def post_batch(self, postings: Iterable[Posting]) -> int:
+        """
+        Apply (account_id, amount, kind) postings, kind being DEPOSIT or
+        WITHDRAW. The whole batch is validated first (kind and account
+        existence) so a bad posting raises before anything is applied.
+        Returns the number of postings applied.
+        """
+        grouped: List[List[Tuple[int, int, float]]] = [
+            [] for _ in range(self.n_stripes)]
+        n_stripes = self.n_stripes
+        n = 0
+        for account_id, amount, kind in postings:
+            if kind == DEPOSIT:
+                field = _DEPOSIT
+            elif kind == WITHDRAW:
+                field = _PAYMENT
+            else:
+                raise ValueError(f"unknown posting kind {kind!r}")
+            s = hash(account_id) % n_stripes
+            if account_id not in self._stripes[s]:
+                raise KeyError(account_id)
+            grouped[s].append((account_id, field, amount))
+            n += 1
+
+        for s, group in enumerate(grouped):
+            if not group:
+                continue
+            accounts = self._stripes[s]
+            with self._locks[s]:
+                for account_id, field, amount in group:
+                    accounts[account_id][field] += amount
+        return n
+
+    def total_balance(self) -> float:
+        """Sum of all balances, taken with every stripe locked at once."""
+        for lock in self._locks:  # fixed order, so no deadlock
+            lock.acquire()
+        try:
+            return sum(b + d - p for accounts in self._stripes
+                       for b, d, p in accounts.values())
+        finally:
+            for lock in reversed(self._locks):
+                lock.release()
+
+
+def _random_postings(n: int, n_accounts: int, seed: int) -> List[Posting]:
+    rng = random.Random(seed)
+    return [(rng.randrange(n_accounts), rng.randrange(1, 100),
+             DEPOSIT if rng.random() < 0.5 else WITHDRAW) for _ in range(n)]
+
+
+def _run_threads(targets: Sequence) -> float:
+    threads = [Thread(target=t) for t in targets]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start
+
+
+def benchmark(n_accounts: int = 1_000_000, n_threads: int = 8,
+              per_thread: int = 200_000, batch_size: int = 1_000) -> None:
+    """
+    Throughput in transactions/sec for per-call posting and batched
+    posting from n_threads writers, checking that no update is lost.
+    """
+    print(f"--- ledger benchmark: {n_accounts} accounts, {n_threads} threads"
+          f" x {per_thread} postings ---")
+    work = [_random_postings(per_thread, n_accounts, seed)
+            for seed in range(n_threads)]
+    expected = sum(a if k == DEPOSIT else -a for w in work for _, a, k in w)
+
+    def per_call(ledger: Ledger, postings: List[Posting]) -> None:
+        for account_id, amount, kind in postings:
+            if kind == DEPOSIT:
+                ledger.deposit(account_id, amount)
+            else:
+                ledger.withdraw(account_id, amount)
+
+    def batched(ledger: Ledger, postings: List[Posting]) -> None:
+        for start in range(0, len(postings), batch_size):
+            ledger.post_batch(postings[start:start + batch_size])
+
+    for name, fn, stripes in [("per-call, 1 lock", per_call, 1),
+                              ("per-call, striped", per_call, DEFAULT_STRIPES),
+                              ("batched, 1 lock", batched, 1),
+                              ("batched, striped", batched, DEFAULT_STRIPES)]:
+        ledger = Ledger(stripes)
+        for account_id in range(n_accounts):
+            ledger.open_account(account_id)
+        elapsed = _run_threads([lambda w=w: fn(ledger, w) for w in work])
+        assert ledger.total_balance() == expected, name
+        total = n_threads * per_thread
+        print(f"{name:20s} {elapsed:8.3f}s  {total / elapsed:12,.0f} tx/s")
+
+
+if __name__ == "__main__":
+    ledger = Ledger()
+    ledger.open_account(1, 100)
+    ledger.deposit(1, 50)
+    ledger.post_batch([(1, 20, WITHDRAW), (1, 5, DEPOSIT)])
+    print("Ledger balance:", ledger.get_balance(1))  # 135
+    benchmark(n_accounts=100_000, n_threads=4, per_thread=100_000)
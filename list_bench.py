@@ -0,0 +1,199 @@
+"""list_bench.py
+
+Reproducible micro-benchmarks for the list-building patterns in list_test.
+
+list_test.advanced_list_techniques and list_test.list_extend_vs_other_methods
+time each pattern once with time.time(), which is noisy and not comparable
+between runs. Here every pattern is run with time.perf_counter_ns after a
+few warmup runs, repeated, and summarized as median and interquartile range
+(IQR) over a sweep of input sizes. Results are written as JSON so runs on
+different Python versions can be diffed, and --baseline turns the run into
+a regression check that fails when a pattern gets slower than the saved
+median by more than --threshold.
+
+Usage:
+    python list_bench.py --output py311.json
+    python list_bench.py --baseline py311.json --threshold 0.10
+"""
+
+from typing import Callable, Dict, List, Optional, Sequence
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+DEFAULT_REPEAT = 15
+DEFAULT_WARMUP = 3
+DEFAULT_THRESHOLD = 0.10
+
+
+# Patterns from advanced_list_techniques: build [i * 2 for i in range(n)].
+
+def append_loop(n: int) -> List[int]:
+    result = []
+    for i in range(n):
+        result.append(i * 2)
+    return result
+
+
+def list_comprehension(n: int) -> List[int]:
+    return [i * 2 for i in range(n)]
+
+
+# Patterns from list_extend_vs_other_methods: add [i, i+1, i+2] per step.
+
+def extend_triples(n: int) -> List[int]:
+    result = []
+    for i in range(n):
+        result.extend([i, i + 1, i + 2])
+    return result
+
+
+def append_triples(n: int) -> List[int]:
+    result = []
+    for i in range(n):
+        result.append(i)
+        result.append(i + 1)
+        result.append(i + 2)
+    return result
+
+
+def iadd_triples(n: int) -> List[int]:
+    result = []
+    for i in range(n):
+        result += [i, i + 1, i + 2]
+    return result
+
+
+def comprehension_triples(n: int) -> List[int]:
+    return [item for i in range(n) for item in [i, i + 1, i + 2]]
+
+
+PATTERNS: Dict[str, Callable[[int], List[int]]] = {
+    "append_loop": append_loop,
+    "list_comprehension": list_comprehension,
+    "extend_triples": extend_triples,
+    "append_triples": append_triples,
+    "iadd_triples": iadd_triples,
+    "comprehension_triples": comprehension_triples,
+}
+
+
+def measure(fn: Callable[[int], object], n: int, repeat: int = DEFAULT_REPEAT,
+            warmup: int = DEFAULT_WARMUP) -> Dict[str, float]:
+    """
+    Run fn(n) warmup times untimed, then repeat times timed. Returns the
+    median, IQR, min and max in nanoseconds. The garbage collector is
+    paused while timing, as timeit does.
+    """
+    for _ in range(warmup):
+        fn(n)
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter_ns()
+            fn(n)
+            samples.append(time.perf_counter_ns() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    if len(samples) >= 2:
+        q1, _, q3 = statistics.quantiles(samples, n=4)
+    else:
+        q1 = q3 = samples[0]
+    return {"median_ns": statistics.median(samples), "iqr_ns": q3 - q1,
+            "min_ns": min(samples), "max_ns": max(samples),
+            "repeat": repeat}
+
+
+def run_suite(sizes: Sequence[int] = DEFAULT_SIZES,
+              patterns: Optional[Sequence[str]] = None,
+              repeat: int = DEFAULT_REPEAT,
+              warmup: int = DEFAULT_WARMUP) -> Dict:
+    """Measure every pattern at every size; returns a JSON-ready dict."""
+    names = list(patterns or PATTERNS)
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for name in names:
+        fn = PATTERNS[name]
+        results[name] = {str(n): measure(fn, n, repeat, warmup)
+                         for n in sizes}
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "sizes": list(sizes),
+        "warmup": warmup,
+        "results": results,
+    }
+
+
+def compare(current: Dict, baseline: Dict,
+            threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """
+    Regressions of current against baseline: patterns/sizes whose median
+    grew by more than threshold (0.10 = 10 %). Entries missing from either
+    run are ignored.
+    """
+    regressions = []
+    for name, by_size in current["results"].items():
+        for n, stats in by_size.items():
+            old = baseline.get("results", {}).get(name, {}).get(n)
+            if not old:
+                continue
+            ratio = stats["median_ns"] / old["median_ns"]
+            if ratio > 1 + threshold:
+                regressions.append(f"{name} n={n}: {ratio - 1:+.1%} "
+                                   f"({old['median_ns'] / 1e6:.3f} ms -> "
+                                   f"{stats['median_ns'] / 1e6:.3f} ms)")
+    return regressions
+
+
+def print_report(report: Dict) -> None:
+    print(f"Python {report['python']} ({report['implementation']})")
+    for name, by_size in report["results"].items():
+        for n, stats in by_size.items():
+            print(f"{name:22s} n={n:>8s}  median {stats['median_ns'] / 1e6:9.3f} ms"
+                  f"  IQR {stats['iqr_ns'] / 1e6:8.3f} ms")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[2])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=list(DEFAULT_SIZES))
+    parser.add_argument("--patterns", nargs="+", choices=list(PATTERNS))
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON from an earlier run; exit 1 "
+                        "if any pattern regressed")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown as a fraction (default 0.10)")
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    report = run_suite(args.sizes, args.patterns, args.repeat, args.warmup)
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for line in regressions:
+            print("REGRESSION", line)
+        if regressions:
+            return 1
+        print(f"no regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -322,19 +322,14 @@ def advanced_list_techniques():
     # 5. List performance tips
     print("\n5. Performance Tips:")
     # Use list comprehension instead of loops
-    import time
+    # (median of repeated runs; see list_bench.py for the full suite)
+    from list_bench import measure, append_loop, list_comprehension
     
     # Inefficient way
-    start = time.time()
-    result1 = []
-    for i in range(100000):
-        result1.append(i * 2)
-    time1 = time.time() - start
+    time1 = measure(append_loop, 100000)["median_ns"] / 1e9
     
     # Efficient way
-    start = time.time()
-    result2 = [i * 2 for i in range(100000)]
-    time2 = time.time() - start
+    time2 = measure(list_comprehension, 100000)["median_ns"] / 1e9
     
     print(f"Loop method time: {time1:.4f}s")
     print(f"List comprehension time: {time2:.4f}s")
@@ -542,35 +537,21 @@ def list_extend_vs_other_methods():
     
     # 5. Performance comparison
     print("\n5. Performance comparison:")
-    import time
+    # Median of repeated runs; see list_bench.py for size sweeps and JSON
+    from list_bench import (measure, extend_triples, append_triples,
+                            iadd_triples, comprehension_triples)
     
     # Method 1: extend()
-    start = time.time()
-    result1 = []
-    for i in range(10000):
-        result1.extend([i, i+1, i+2])
-    time1 = time.time() - start
+    time1 = measure(extend_triples, 10000)["median_ns"] / 1e9
     
     # Method 2: append() in loop
-    start = time.time()
-    result2 = []
-    for i in range(10000):
-        result2.append(i)
-        result2.append(i+1)
-        result2.append(i+2)
-    time2 = time.time() - start
+    time2 = measure(append_triples, 10000)["median_ns"] / 1e9
     
     # Method 3: += operator
-    start = time.time()
-    result3 = []
-    for i in range(10000):
-        result3 += [i, i+1, i+2]
-    time3 = time.time() - start
+    time3 = measure(iadd_triples, 10000)["median_ns"] / 1e9
     
     # Method 4: List comprehension (for comparison)
-    start = time.time()
-    result4 = [item for i in range(10000) for item in [i, i+1, i+2]]
-    time4 = time.time() - start
+    time4 = measure(comprehension_triples, 10000)["median_ns"] / 1e9
     
     print(f"extend() method: {time1:.4f}s")
     print(f"append() in loop: {time2:.4f}s")
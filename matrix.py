@@ -0,0 +1,191 @@
+"""matrix.py
+
+One Matrix API over two backends: nested Python lists and NumPy arrays.
+
+list_test adds matrices with nested comprehensions, transposes and flattens
+with nested loops, and iteration.matrix_test fills a [[INF] * c ...] grid
+and walks it cell by cell. Matrix offers add, transpose, flatten, full and
+traverse for both. The NumPy backend uses a view for transpose, ravel for
+flatten and np.full for the INF grid; the list backend keeps the plain
+Python code, which wins for tiny matrices where NumPy's per-call overhead
+dominates. backend="auto" picks by size (see SMALL_CELLS).
+
+Run this file for the crossover benchmark that SMALL_CELLS is based on.
+"""
+
+from typing import Iterator, List, Sequence, Tuple, Union
+import time
+
+import numpy as np
+
+LIST, NUMPY, AUTO = "list", "numpy", "auto"
+# From about 8x8 on, NumPy wins every operation but traverse in the
+# crossover benchmark; smaller inputs stay lists and skip the conversion.
+SMALL_CELLS = 64
+
+Number = Union[int, float]
+
+
+def _pick(backend: str, rows: int, cols: int) -> str:
+    if backend == AUTO:
+        return LIST if rows * cols < SMALL_CELLS else NUMPY
+    if backend not in (LIST, NUMPY):
+        raise ValueError(f"unknown backend {backend!r}")
+    return backend
+
+
+class Matrix:
+    """A 2-D matrix stored as a list of rows or as a 2-D ndarray."""
+
+    def __init__(self, data: Union[Sequence[Sequence[Number]], np.ndarray],
+                 backend: str = AUTO):
+        if isinstance(data, np.ndarray):
+            if data.ndim != 2:
+                raise ValueError("Matrix data must be 2-D")
+            rows, cols = data.shape
+        else:
+            rows = len(data)
+            cols = len(data[0]) if rows else 0
+            if any(len(row) != cols for row in data):
+                raise ValueError("all rows must have the same length")
+        self.backend = _pick(backend, rows, cols)
+        if self.backend == NUMPY:
+            self.data = np.asarray(data)
+        elif isinstance(data, np.ndarray):
+            self.data = data.tolist()
+        else:
+            self.data = [list(row) for row in data]
+
+    @classmethod
+    def _wrap(cls, data, backend: str) -> "Matrix":
+        m = cls.__new__(cls)
+        m.data = data
+        m.backend = backend
+        return m
+
+    @classmethod
+    def full(cls, rows: int, cols: int, value: Number,
+             backend: str = AUTO) -> "Matrix":
+        """rows x cols matrix filled with value, e.g. float('inf')."""
+        backend = _pick(backend, rows, cols)
+        if backend == NUMPY:
+            return cls._wrap(np.full((rows, cols), value), NUMPY)
+        return cls._wrap([[value] * cols for _ in range(rows)], LIST)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        if self.backend == NUMPY:
+            return self.data.shape
+        rows = len(self.data)
+        return rows, len(self.data[0]) if rows else 0
+
+    def __getitem__(self, rc: Tuple[int, int]) -> Number:
+        r, c = rc
+        return self.data[r, c] if self.backend == NUMPY else self.data[r][c]
+
+    def __setitem__(self, rc: Tuple[int, int], value: Number) -> None:
+        r, c = rc
+        if self.backend == NUMPY:
+            self.data[r, c] = value
+        else:
+            self.data[r][c] = value
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Matrix):
+            return NotImplemented
+        return self.shape == other.shape and self.to_list() == other.to_list()
+
+    def __repr__(self) -> str:
+        return f"Matrix({self.to_list()}, backend={self.backend!r})"
+
+    def to_list(self) -> List[List[Number]]:
+        if self.backend == NUMPY:
+            return self.data.tolist()
+        return [list(row) for row in self.data]
+
+    def add(self, other: "Matrix") -> "Matrix":
+        if self.shape != other.shape:
+            raise ValueError(f"shape mismatch {self.shape} vs {other.shape}")
+        if self.backend == NUMPY or other.backend == NUMPY:
+            return Matrix._wrap(np.asarray(self.data) + np.asarray(other.data),
+                                NUMPY)
+        a, b = self.data, other.data
+        return Matrix._wrap([[a[i][j] + b[i][j] for j in range(len(a[0]))]
+                             for i in range(len(a))], LIST)
+
+    __add__ = add
+
+    def transpose(self) -> "Matrix":
+        """For the NumPy backend a view: no data is copied."""
+        if self.backend == NUMPY:
+            return Matrix._wrap(self.data.T, NUMPY)
+        m = self.data
+        if not m:
+            return Matrix._wrap([], LIST)
+        return Matrix._wrap([[row[i] for row in m] for i in range(len(m[0]))],
+                            LIST)
+
+    @property
+    def T(self) -> "Matrix":
+        return self.transpose()
+
+    def flatten(self) -> Union[List[Number], np.ndarray]:
+        """Row-major cells; a view (ravel) when the layout allows it."""
+        if self.backend == NUMPY:
+            return self.data.ravel()
+        return [item for row in self.data for item in row]
+
+    def traverse(self) -> Iterator[Tuple[int, int, Number]]:
+        """Yield (row, col, value) for every cell in row-major order."""
+        # Cell-by-cell work is Python either way; tolist() converts the
+        # NumPy data in one call instead of boxing every element separately.
+        rows = self.data.tolist() if self.backend == NUMPY else self.data
+        for r, row in enumerate(rows):
+            for c, value in enumerate(row):
+                yield r, c, value
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark(sizes: Sequence[int] = (2, 4, 8, 16, 32, 64, 128, 512, 1024),
+              repeat: int = 5) -> None:
+    """Time each operation on n x n matrices with both backends."""
+    print("--- matrix crossover benchmark (best of %d, microseconds) ---"
+          % repeat)
+    print(f"{'op':10s} {'n':>5s} {'list':>12s} {'numpy':>12s}  winner")
+    inf = float("inf")
+    for n in sizes:
+        data = [[i * n + j for j in range(n)] for i in range(n)]
+        mats = {LIST: (Matrix(data, LIST), Matrix(data, LIST)),
+                NUMPY: (Matrix(data, NUMPY), Matrix(data, NUMPY))}
+        ops = {
+            "add": lambda a, b: a.add(b),
+            "transpose": lambda a, b: a.transpose(),
+            "flatten": lambda a, b: a.flatten(),
+            "full": lambda a, b: Matrix.full(n, n, inf, a.backend),
+            "traverse": lambda a, b: sum(1 for _ in a.traverse()),
+        }
+        for op, fn in ops.items():
+            t = {b: _best_of(lambda b=b: fn(*mats[b]), repeat) * 1e6
+                 for b in (LIST, NUMPY)}
+            winner = min(t, key=t.get)
+            print(f"{op:10s} {n:5d} {t[LIST]:12.1f} {t[NUMPY]:12.1f}  {winner}")
+
+
+if __name__ == "__main__":
+    a = Matrix([[1, 2], [3, 4]])
+    b = Matrix([[5, 6], [7, 8]])
+    print("A + B:", (a + b).to_list())
+    m = Matrix([[1, 2, 3], [4, 5, 6], [7, 8, 9]], backend=NUMPY)
+    print("Transposed:", m.T.to_list())
+    print("Flattened:", m.flatten())
+    grid = Matrix.full(2, 3, float("inf"))
+    print("INF grid:", grid.to_list())
+    benchmark()
@@ -1,5 +1,10 @@
+import os
+
 import numpy as np
 
+from data_loader import load_int32, filter_not_odd
+from growable_array import GrowableArray
+
 a = np.array([[1,2,3,4,5], [6,7,8,9,10]])
 print(a)
 
@@ -101,6 +106,14 @@ print(m1)
 m1 = np.vstack([m1,m1])
 print(m1)
 
+# Growing row by row with vstack copies everything each time (quadratic);
+# GrowableArray doubles a preallocated buffer instead.
+g = GrowableArray(3, dtype='int64')
+g.append_row(r1)
+g.append_row(r2)
+g.extend_rows(g.view())
+print(g.view()) # same as m1
+
 # Horizontal stack
 c1 = np.array([1,1,1])
 c2 = np.array([2,2,2])
@@ -110,10 +123,14 @@ print(m2)
 ### Miscellaneous
 # Load data from file
 print("Load data from file")
-data = np.genfromtxt('/harddisk1/liangzhao/Projects/pytest/data.txt', delimiter=',')
-data = data.astype('int32') # convert the data type to int32
+# np.genfromtxt(path, delimiter=',').astype('int32') parses in Python and
+# keeps a float64 and an int32 copy; load_int32 parses in chunks straight
+# into int32 (pass cache=True to keep a memory-mapped .npy copy next to the
+# file for later runs). The result is always 2-D.
+data_path = os.environ.get('DATA_PATH', '/harddisk1/liangzhao/Projects/pytest/data.txt')
+data = load_int32(data_path, delimiter=',')
 print(data)
-data_copy = data[data%2 != 1]
+data_copy = filter_not_odd(data) # same as data[data%2 != 1], chunk by chunk
 print(data_copy)
 
 # get the element with a list of index
@@ -0,0 +1,119 @@
+"""oop_slots.py
+
+__slots__ versions of oop.Account and oop.MasterAccount.
+
+The classes keep the same names as in oop.py, so name mangling is unchanged
+(_Account__dunder_method, _MasterAccount__dunder_method) and switching is
+just a change of import. With __slots__ the attributes live in fixed slots
+on the instance instead of a per-instance __dict__, which saves memory and
+makes attribute access a little faster. The price: no new attributes can be
+added to an instance at runtime.
+
+Run this file to measure per-instance memory and attribute speed against
+oop.py.
+"""
+
+import time
+import tracemalloc
+
+import oop
+
+
+class Account:
+    __slots__ = ("id", "balance", "payment_amt", "deposit_amt")
+
+    def __init__(self, id, balance):
+        self.id = id
+        self.balance = balance
+        self.payment_amt = 0
+        self.deposit_amt = 0
+
+    def deposit(self, amount):
+        self.deposit_amt += amount
+
+    def withdraw(self, amount):
+        self.payment_amt += amount
+
+    def get_balance(self):
+        return self.balance + self.deposit_amt - self.payment_amt
+
+    def __dunder_method(self):
+        print("The double underscore is to avoid overriding by child class")
+
+    def base_method(self):
+        print("This is a base method in Account, can be overridden by child class")
+
+
+class MasterAccount(Account):
+    # Empty: the parent slots are inherited, and leaving __slots__ out here
+    # would bring the per-instance __dict__ back.
+    __slots__ = ()
+
+    def __init__(self, id, balance):
+        super().__init__(id, balance)
+        self.balance = balance
+
+    def get_balance(self):
+        """
+        The child class can override the parent class method.
+        1. completely implement different logic
+        2. call the parent class method to get the parent class
+           result, then add additional logic to it
+        """
+        super().get_balance()
+        print("MasterAccount balance:", self.balance)
+
+    def __dunder_method(self):
+        print("This is a private method in MasterAccount")
+
+    def base_method(self):
+        print("Override base method by child class")
+
+
+def _instances_memory(cls, n: int) -> float:
+    """Average bytes per instance, including the list that holds them."""
+    tracemalloc.start()
+    objs = [cls(i, i) for i in range(n)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objs
+    return current / n
+
+
+def _access_time(cls, n: int) -> tuple:
+    objs = [cls(i, i) for i in range(n)]
+    start = time.perf_counter()
+    total = 0
+    for a in objs:
+        total += a.balance + a.deposit_amt - a.payment_amt
+    t_read = time.perf_counter() - start
+    start = time.perf_counter()
+    for a in objs:
+        a.deposit_amt += 1
+        a.payment_amt += 2
+    t_write = time.perf_counter() - start
+    return t_read, t_write
+
+
+def benchmark(n: int = 10**6) -> None:
+    print(f"--- __slots__ benchmark: {n} instances ---")
+    for label, cls in [("oop.Account", oop.Account),
+                       ("slots Account", Account),
+                       ("oop.MasterAccount", oop.MasterAccount),
+                       ("slots MasterAccount", MasterAccount)]:
+        per_obj = _instances_memory(cls, n)
+        t_read, t_write = _access_time(cls, n)
+        print(f"{label:20s} {per_obj:7.1f} bytes/instance  "
+              f"read {t_read:7.4f}s  update {t_write:7.4f}s")
+
+
+if __name__ == "__main__":
+    account = Account(1, 100)
+    print("Account balance:", account.get_balance())
+    account._Account__dunder_method()
+    master_account = MasterAccount(2, 200)
+    print("MasterAccount balance:", master_account.get_balance())
+    master_account._MasterAccount__dunder_method()
+    master_account.base_method()
+    print("has __dict__:", hasattr(master_account, "__dict__"))
+    benchmark()
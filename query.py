@@ -0,0 +1,292 @@
+"""query.py
+
+Lazy, fused filter / map / sort / take pipelines.
+
+list_test.sorting_and_filtering and list_test.list_comprehension_examples
+chain list comprehensions, filter(lambda ...), sorted(..., key=len) and
+max / min, and every step builds a full intermediate list. A Query only
+records its stages:
+
+    Query(numbers).filter(lambda x: x % 2 == 0).map(lambda x: x ** 2)
+                  .sort().take(10).to_list()
+
+and runs them when a result is asked for. Consecutive filter and map stages
+are fused into one pass of chained filter / map iterators, so no
+intermediate list exists, and sort followed by take(n) becomes a bounded
+heap (top_k.TopK): O(n log k) time and O(k) memory instead of a full sort.
+
+With the NumPy backend (the default for ndarray sources) each stage is
+applied to the whole array: lambda x: x % 2 == 0 evaluated on an array is a
+boolean mask, lambda x: x ** 2 a vectorized map, and sort + take an
+np.partition. A stage whose function does not vectorize (it returns a
+scalar, or raises TypeError) switches the rest of the pipeline to the
+Python backend.
+
+Run this file to compare runtime and peak memory with the chained
+comprehensions.
+"""
+
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+import random
+import time
+import tracemalloc
+
+import numpy as np
+
+from top_k import TopK
+
+AUTO = "auto"
+PYTHON = "python"
+NUMPY = "numpy"
+BACKENDS = (AUTO, PYTHON, NUMPY)
+
+FILTER = "filter"
+MAP = "map"
+SORT = "sort"
+TAKE = "take"
+
+
+class Query:
+    """
+    A lazy pipeline over an iterable. filter, map, sort and take return a
+    new Query; to_list, iteration, count, max and min run it.
+    """
+
+    def __init__(self, source: Iterable[Any], backend: str = AUTO,
+                 _stages: Tuple[Tuple[str, Any], ...] = ()):
+        if backend not in BACKENDS:
+            raise ValueError(f"unknown backend {backend!r}")
+        self.source = source
+        self.backend = backend
+        self._stages = _stages
+
+    def _then(self, op: str, arg: Any) -> "Query":
+        return Query(self.source, self.backend, self._stages + ((op, arg),))
+
+    def filter(self, predicate: Callable[[Any], Any]) -> "Query":
+        return self._then(FILTER, predicate)
+
+    def map(self, fn: Callable[[Any], Any]) -> "Query":
+        return self._then(MAP, fn)
+
+    def sort(self, key: Optional[Callable[[Any], Any]] = None,
+             reverse: bool = False) -> "Query":
+        """Stable, like sorted(..., key=key, reverse=reverse)."""
+        return self._then(SORT, (key, reverse))
+
+    def take(self, n: int) -> "Query":
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        return self._then(TAKE, n)
+
+    # -- execution ------------------------------------------------------
+
+    def _use_numpy(self) -> bool:
+        if self.backend == AUTO:
+            return isinstance(self.source, np.ndarray)
+        return self.backend == NUMPY
+
+    def _run(self) -> Iterable[Any]:
+        stages = list(self._stages)
+        data: Any = self.source
+        if self._use_numpy():
+            data, stages = _run_numpy(np.asarray(data), stages)
+            if not stages:
+                return data
+            data = data.tolist()
+        return _run_python(data, stages)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._run())
+
+    def to_list(self) -> List[Any]:
+        data = self._run()
+        return data.tolist() if isinstance(data, np.ndarray) else list(data)
+
+    def count(self) -> int:
+        data = self._run()
+        if isinstance(data, (np.ndarray, list)):
+            return len(data)
+        return sum(1 for _ in data)
+
+    def max(self, key: Optional[Callable[[Any], Any]] = None) -> Any:
+        data = self._run()
+        if isinstance(data, np.ndarray) and key is None:
+            return data.max().item()
+        return max(data, key=key)
+
+    def min(self, key: Optional[Callable[[Any], Any]] = None) -> Any:
+        data = self._run()
+        if isinstance(data, np.ndarray) and key is None:
+            return data.min().item()
+        return min(data, key=key)
+
+
+def _run_python(data: Iterable[Any],
+                stages: List[Tuple[str, Any]]) -> Iterable[Any]:
+    it: Iterable[Any] = data
+    i = 0
+    while i < len(stages):
+        op, arg = stages[i]
+        if op == FILTER:
+            it = filter(arg, it)
+        elif op == MAP:
+            it = map(arg, it)
+        elif op == TAKE:
+            it = islice(it, arg)
+        else:
+            key, reverse = arg
+            if i + 1 < len(stages) and stages[i + 1][0] == TAKE:
+                i += 1
+                tk = TopK(stages[i][1], key=key, largest=reverse)
+                tk.extend(it)
+                it = tk.result()
+            else:
+                it = sorted(it, key=key, reverse=reverse)
+        i += 1
+    return it
+
+
+def _vectorized(fn: Callable[[Any], Any], arr: np.ndarray) -> Optional[np.ndarray]:
+    """fn applied to the whole array, or None if fn is not elementwise."""
+    try:
+        out = fn(arr)
+    except (TypeError, ValueError, AttributeError):
+        return None
+    if not isinstance(out, np.ndarray) or out.shape != arr.shape:
+        return None
+    return out
+
+
+def _run_numpy(arr: np.ndarray, stages: List[Tuple[str, Any]]
+               ) -> Tuple[np.ndarray, List[Tuple[str, Any]]]:
+    """
+    Apply stages to arr while they vectorize. Returns the array and the
+    stages still to run on the Python backend.
+    """
+    i = 0
+    while i < len(stages):
+        op, arg = stages[i]
+        if op == FILTER:
+            mask = _vectorized(arg, arr)
+            if mask is None or mask.dtype != np.bool_:
+                break
+            arr = arr[mask]
+        elif op == MAP:
+            out = _vectorized(arg, arr)
+            if out is None:
+                break
+            arr = out
+        elif op == TAKE:
+            arr = arr[:arg]
+        else:
+            key, reverse = arg
+            keys = arr if key is None else _vectorized(key, arr)
+            if keys is None:
+                break
+            k = None
+            if i + 1 < len(stages) and stages[i + 1][0] == TAKE:
+                i += 1
+                k = stages[i][1]
+            arr = arr[_argsort(keys, reverse, k)]
+        i += 1
+    return arr, stages[i:]
+
+
+def _argsort(keys: np.ndarray, reverse: bool,
+             k: Optional[int] = None) -> np.ndarray:
+    """
+    Indices of the first k keys in stable sorted order (ties keep their
+    original order, also when reverse is set). With k < len(keys), only
+    the candidates up to the k-th key from np.partition are sorted.
+    """
+    n = len(keys)
+    idx = np.arange(n)
+    if k is not None and k < n:
+        if k == 0:
+            return idx[:0]
+        if reverse:
+            kth = np.partition(keys, n - k)[n - k]
+            idx = np.flatnonzero(keys >= kth)
+        else:
+            kth = np.partition(keys, k - 1)[k - 1]
+            idx = np.flatnonzero(keys <= kth)
+        keys = keys[idx]
+    if reverse:
+        # Stable descending: sort the reversed keys ascending, reverse back.
+        order = (len(keys) - 1 - np.argsort(keys[::-1], kind="stable"))[::-1]
+    else:
+        order = np.argsort(keys, kind="stable")
+    return idx[order[:k]]
+
+
+def _chained_numbers(numbers: List[int], k: int) -> List[int]:
+    even_numbers = [x for x in numbers if x % 2 == 0]
+    squares = [x ** 2 for x in even_numbers]
+    return sorted(squares, reverse=True)[:k]
+
+
+def _query_numbers(numbers, k: int) -> List[int]:
+    return (Query(numbers).filter(lambda x: x % 2 == 0).map(lambda x: x ** 2)
+            .sort(reverse=True).take(k).to_list())
+
+
+def _chained_words(words: List[str], k: int) -> List[str]:
+    long_words = list(filter(lambda w: len(w) > 5, words))
+    upper_words = [w.upper() for w in long_words]
+    return sorted(upper_words, key=len)[:k]
+
+
+def _query_words(words: List[str], k: int) -> List[str]:
+    return (Query(words).filter(lambda w: len(w) > 5).map(str.upper)
+            .sort(key=len).take(k).to_list())
+
+
+def _measure(fn: Callable[[], Any]) -> Tuple[Any, float, int]:
+    """Result, seconds, and traced peak bytes (from a second, traced run)."""
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def benchmark(n: int = 10_000_000, k: int = 10, seed: int = 0) -> None:
+    print(f"--- query pipeline benchmark: n={n}, take {k} ---")
+    rng = random.Random(seed)
+    numbers = [rng.randrange(1 << 20) for _ in range(n)]
+    array = np.array(numbers)
+    vocab = ['apple', 'pie', 'banana', 'cherry', 'hello', 'world', 'python',
+             'programming', 'list', 'comprehension']
+    words = [rng.choice(vocab) + str(rng.randrange(100)) for _ in range(n)]
+    rows = [
+        ("numbers: chained", lambda: _chained_numbers(numbers, k)),
+        ("numbers: Query", lambda: _query_numbers(numbers, k)),
+        ("numbers: Query (numpy)", lambda: _query_numbers(array, k)),
+        ("words: chained", lambda: _chained_words(words, k)),
+        ("words: Query", lambda: _query_words(words, k)),
+    ]
+    expected = {}
+    for name, fn in rows:
+        result, elapsed, peak = _measure(fn)
+        group = name.split(":")[0]
+        assert expected.setdefault(group, result) == result, name
+        print(f"{name:24s} {elapsed:8.3f}s  peak {peak / 2**20:9.2f} MiB")
+
+
+if __name__ == "__main__":
+    numbers = [64, 34, 25, 12, 22, 11, 90]
+    words = ['apple', 'pie', 'banana', 'cherry']
+    print("Sorted by length:", Query(words).sort(key=len).to_list())
+    print("Even numbers:", Query(numbers).filter(lambda x: x % 2 == 0).to_list())
+    print("Odd numbers:",
+          Query(np.array(numbers)).filter(lambda x: x % 2 != 0).to_list())
+    print("Even squares:", Query(range(1, 11)).filter(lambda x: x % 2 == 0)
+          .map(lambda x: x ** 2).to_list())
+    print("Two largest:", Query(numbers).sort(reverse=True).take(2).to_list())
+    print(f"Max: {Query(numbers).max()}, Min: {Query(numbers).min()}")
+    benchmark(n=1_000_000)
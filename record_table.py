@@ -0,0 +1,230 @@
+"""record_table.py
+
+Schema-driven columnar storage for fixed-shape records.
+
+list_test.mixed_type_lists_benefits stores people as lists of
+[name, age, height, employed, job] and as namedtuple rows: one Python
+object per field per record. RecordTable keeps each field in a typed NumPy
+column instead. Numeric and bool fields are plain arrays; string fields are
+dictionary-encoded categoricals (an integer code per row plus one list of
+distinct values), so a name or job repeated a million times is stored once.
+
+Filters are vectorized boolean masks over the columns
+(table.filter((table.employed) & (table["age"] > 30))), select projects
+columns, and iterating yields namedtuple rows built lazily, one at a time.
+
+Run this file to compare memory per record and filter throughput with
+list-of-lists and list-of-namedtuples.
+"""
+
+from collections import namedtuple
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+CATEGORY = "category"  # schema type for dictionary-encoded strings
+ITER_CHUNK = 4096  # rows converted to Python values per step when iterating
+
+
+class Categorical:
+    """Strings stored as int32 codes into a list of distinct values."""
+
+    def __init__(self, values: Iterable[str] = ()):
+        self.categories: List[str] = []
+        self._index: Dict[str, int] = {}
+        self.codes = np.asarray([self._code(v) for v in values],
+                                dtype=np.int32)
+
+    def _code(self, value: str) -> int:
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.categories)
+            self.categories.append(value)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, i: int) -> str:
+        return self.categories[self.codes[i]]
+
+    def take(self, idx) -> "Categorical":
+        out = Categorical()
+        out.categories, out._index = self.categories, self._index
+        out.codes = self.codes[idx]
+        return out
+
+    def __eq__(self, value: str) -> np.ndarray:  # type: ignore[override]
+        """Vectorized comparison against one string, as a boolean mask."""
+        code = self._index.get(value)
+        if code is None:
+            return np.zeros(len(self.codes), dtype=bool)
+        return self.codes == code
+
+    def __ne__(self, value: str) -> np.ndarray:  # type: ignore[override]
+        return ~(self == value)
+
+    def isin(self, values: Iterable[str]) -> np.ndarray:
+        codes = [self._index[v] for v in values if v in self._index]
+        return np.isin(self.codes, codes)
+
+    def tolist(self) -> List[str]:
+        cats = self.categories
+        return [cats[c] for c in self.codes.tolist()]
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + sum(sys.getsizeof(c)
+                                       for c in self.categories)
+
+
+class RecordTable:
+    """
+    Columns described by a schema: an ordered list of (field, type) where
+    type is a NumPy dtype or CATEGORY.
+    """
+
+    def __init__(self, schema: Sequence[Tuple[str, Any]],
+                 columns: Dict[str, Any]):
+        self.schema = list(schema)
+        self.fields = [name for name, _ in self.schema]
+        self.columns = columns
+        lengths = {len(columns[name]) for name in self.fields}
+        if len(lengths) > 1:
+            raise ValueError("all columns must have the same length")
+        self.Row = namedtuple("Row", self.fields)
+
+    @classmethod
+    def from_rows(cls, schema: Sequence[Tuple[str, Any]],
+                  rows: Iterable[Sequence[Any]]) -> "RecordTable":
+        """Build from list rows or namedtuples in schema field order."""
+        cols = list(zip(*rows)) or [() for _ in schema]
+        columns: Dict[str, Any] = {}
+        for (name, kind), values in zip(schema, cols):
+            if kind == CATEGORY:
+                columns[name] = Categorical(values)
+            else:
+                columns[name] = np.asarray(values, dtype=kind)
+        return cls(schema, columns)
+
+    def __len__(self) -> int:
+        return len(self.columns[self.fields[0]]) if self.fields else 0
+
+    def __getitem__(self, name: str):
+        return self.columns[name]
+
+    def __getattr__(self, name: str):
+        columns = self.__dict__.get("columns", {})
+        if name in columns:
+            return columns[name]
+        raise AttributeError(name)
+
+    def filter(self, mask: np.ndarray) -> "RecordTable":
+        """Rows where the boolean mask is True."""
+        idx = np.flatnonzero(mask)
+        return RecordTable(self.schema, {
+            name: col.take(idx) for name, col in self.columns.items()})
+
+    def select(self, *names: str) -> "RecordTable":
+        """Projection onto a subset of columns (no data is copied)."""
+        schema = [(n, k) for n, k in self.schema if n in names]
+        return RecordTable(schema, {n: self.columns[n] for n, _ in schema})
+
+    def row(self, i: int):
+        return self.Row(*(self._value(self.columns[n], i)
+                          for n in self.fields))
+
+    @staticmethod
+    def _value(col, i: int):
+        value = col[i]
+        return value.item() if isinstance(value, np.generic) else value
+
+    def __iter__(self) -> Iterator[Any]:
+        """
+        namedtuple rows, built one at a time. Columns are converted to
+        Python values ITER_CHUNK rows at a time, so only one chunk of field
+        objects exists beyond the rows the caller keeps.
+        """
+        cols = [self.columns[n] for n in self.fields]
+        Row = self.Row
+        for start in range(0, len(self), ITER_CHUNK):
+            part = slice(start, start + ITER_CHUNK)
+            for values in zip(*(col.take(part).tolist()
+                                if isinstance(col, Categorical)
+                                else col[part].tolist() for col in cols)):
+                yield Row(*values)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(col.nbytes for col in self.columns.values())
+
+
+PERSON_SCHEMA = [("name", CATEGORY), ("age", np.int16),
+                 ("height", np.float64), ("employed", np.bool_),
+                 ("job", CATEGORY)]
+Person = namedtuple('Person', ['name', 'age', 'height', 'employed', 'job'])
+
+
+def _random_people(n: int, seed: int = 0) -> List[list]:
+    rng = random.Random(seed)
+    names = [f"person{i}" for i in range(10_000)]
+    jobs = ["Engineer", "Student", "Manager", "Designer", "Nurse", "Teacher"]
+    return [[rng.choice(names), rng.randint(18, 80),
+             round(rng.uniform(4.5, 7.0), 1), rng.random() < 0.6,
+             rng.choice(jobs)] for _ in range(n)]
+
+
+def _traced(build):
+    tracemalloc.start()
+    obj = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, size
+
+
+def benchmark(n: int = 1_000_000) -> None:
+    """
+    Memory is what building the container allocates. The string values
+    themselves are shared by all three layouts and not counted.
+    """
+    print(f"--- record table benchmark: {n} records ---")
+    raw = _random_people(n)
+    lists, b_lists = _traced(lambda: [list(r) for r in raw])
+    tuples, b_tuples = _traced(lambda: [Person(*r) for r in raw])
+    table, b_table = _traced(lambda: RecordTable.from_rows(PERSON_SCHEMA, raw))
+
+    def f_lists():
+        return [p for p in lists if p[3] and p[1] > 30]
+
+    def f_tuples():
+        return [p for p in tuples if p.employed and p.age > 30]
+
+    def f_table():
+        return table.filter(table.employed & (table.age > 30))
+
+    for name, size, fn in [("list of lists", b_lists, f_lists),
+                           ("list of namedtuples", b_tuples, f_tuples),
+                           ("RecordTable", b_table, f_table)]:
+        start = time.perf_counter()
+        kept = len(fn())
+        elapsed = time.perf_counter() - start
+        print(f"{name:20s} {size / n:7.1f} bytes/record  filter "
+              f"{elapsed:7.4f}s ({n / elapsed:14,.0f} records/s, kept {kept})")
+
+
+if __name__ == "__main__":
+    people = [
+        ["Alice", 25, 5.6, True, "Engineer"],
+        ["Bob", 30, 6.0, False, "Student"],
+        ["Charlie", 35, 5.9, True, "Manager"]
+    ]
+    table = RecordTable.from_rows(PERSON_SCHEMA, people)
+    for person in table.filter(table.employed & (table.age > 30)):
+        print(f"  {person.name}: {person.age} years, {person.height:.1f}ft")
+        print(f"    Employed: {person.employed}, Job: {person.job}")
+    print("Jobs:", table.select("name", "job").job.tolist())
+    benchmark()
@@ -0,0 +1,277 @@
+"""ring_buffer.py
+
+Fixed-capacity ring buffer over a typed NumPy array.
+
+data_structure.init_data_structure and demo_deque_counter_defaultdict use
+deque(maxlen=3) as a bounded queue / stack. For windows of millions of
+floats a deque stores one Python object per value, and an aggregate such as
+sum(dq) / len(dq) walks the whole window every time.
+
+RingBuffer has deque's append, appendleft, pop, popleft, rotate and maxlen
+eviction, but stores the values in one NumPy array and keeps a running sum,
+so sum and mean are O(1). The array is mirrored (every value is written at
+i and i + maxlen), which makes the window one contiguous slice: view()
+returns it in order without copying, ready for any NumPy reduction.
+
+The running sum of a float buffer is recomputed from the data every maxlen
+updates, so rounding error does not build up (amortized O(1)). Subtracting
+a NaN or +-inf cannot undo adding it, so the sum is also recomputed
+whenever one of them leaves the window.
+
+Run this file to benchmark against deque.
+"""
+
+from collections import deque
+from typing import Any, Iterable, Iterator, List, Union
+import time
+
+import numpy as np
+
+
+class RingBuffer:
+    """A deque(maxlen=maxlen) of numbers backed by a NumPy array."""
+
+    def __init__(self, maxlen: int, dtype=np.float64, iterable: Iterable = ()):
+        if maxlen <= 0:
+            raise ValueError("maxlen must be positive")
+        self.maxlen = maxlen
+        self._buf = np.zeros(2 * maxlen, dtype=dtype)
+        # Single items go through a memoryview: much cheaper than NumPy
+        # scalar indexing, and reads come back as Python numbers.
+        self._cells = memoryview(self._buf)
+        self._head = 0
+        self._len = 0
+        self._exact = not np.issubdtype(self._buf.dtype, np.inexact)
+        self._sum: Union[int, float] = 0 if self._exact else 0.0
+        self._updates = 0
+        self.extend(np.asarray(list(iterable) if not isinstance(
+            iterable, np.ndarray) else iterable, dtype=dtype))
+
+    @property
+    def dtype(self):
+        return self._buf.dtype
+
+    def __len__(self) -> int:
+        return self._len
+
+    def _write(self, i: int, value: Any) -> None:
+        try:
+            self._cells[i] = self._cells[i + self.maxlen] = value
+        except TypeError:  # e.g. a float into an integer buffer
+            self._buf[i] = self._buf[i + self.maxlen] = value
+
+    def _added(self, value: Any) -> None:
+        self._sum += value
+
+    def _removed(self, value: Any) -> None:
+        self._sum -= value
+        self._updates += 1
+        if value - value:  # NaN or +-inf
+            self._updates = self.maxlen  # resync in _settle
+
+    def _settle(self) -> None:
+        """Called once the buffer is consistent again after an update."""
+        if not self._exact and self._updates >= self.maxlen:
+            self._resync()
+
+    def _resync(self) -> None:
+        self._sum = self.view().sum().item()
+        self._updates = 0
+
+    def append(self, value: Any) -> None:
+        """Add to the right; when full, the leftmost value is dropped."""
+        m = self.maxlen
+        if self._len == m:
+            self._removed(self._cells[self._head])
+            self._head = self._head + 1 if self._head + 1 < m else 0
+        else:
+            self._len += 1
+        i = self._head + self._len - 1
+        self._write(i if i < m else i - m, value)
+        self._added(self._cells[i])
+        self._settle()
+
+    def appendleft(self, value: Any) -> None:
+        """Add to the left; when full, the rightmost value is dropped."""
+        if self._len == self.maxlen:
+            self._removed(self._cells[self._head + self._len - 1])
+        else:
+            self._len += 1
+        self._head = self._head - 1 if self._head else self.maxlen - 1
+        self._write(self._head, value)
+        self._added(self._cells[self._head])
+        self._settle()
+
+    def pop(self) -> Any:
+        if not self._len:
+            raise IndexError("pop from an empty deque")
+        self._len -= 1
+        value = self._cells[self._head + self._len]
+        self._removed(value)
+        self._settle()
+        return value
+
+    def popleft(self) -> Any:
+        if not self._len:
+            raise IndexError("pop from an empty deque")
+        value = self._cells[self._head]
+        self._head = self._head + 1 if self._head + 1 < self.maxlen else 0
+        self._len -= 1
+        self._removed(value)
+        self._settle()
+        return value
+
+    def rotate(self, n: int = 1) -> None:
+        """Rotate n steps to the right (left if n is negative), like deque."""
+        if self._len <= 1:
+            return
+        if self._len == self.maxlen:
+            self._head = (self._head - n) % self.maxlen
+            return
+        data = np.roll(self.view(), n)
+        self._head = 0
+        self._buf[:self._len] = data
+        self._buf[self.maxlen:self.maxlen + self._len] = data
+
+    def extend(self, values: Union[Iterable, np.ndarray]) -> None:
+        """Append many values with vectorized writes."""
+        values = np.asarray(values, dtype=self._buf.dtype).ravel()
+        m, k = self.maxlen, len(values)
+        if k == 0:
+            return
+        if k >= m:
+            self._buf[:m] = self._buf[m:] = values[-m:]
+            self._head, self._len = 0, m
+            self._resync()
+            return
+        drop = max(0, self._len + k - m)
+        added = values.sum().item()
+        if drop:
+            dropped = self.view()[:drop]
+            self._sum -= dropped.sum().item()
+            if not self._exact and not np.isfinite(dropped).all():
+                self._updates = m
+            self._head = (self._head + drop) % m
+            self._len -= drop
+        pos = (self._head + self._len + np.arange(k)) % m
+        self._buf[pos] = values
+        self._buf[pos + m] = values
+        self._len += k
+        self._sum += added
+        self._updates += k
+        self._settle()
+
+    def clear(self) -> None:
+        self._head = self._len = 0
+        self._sum = 0 if self._exact else 0.0
+        self._updates = 0
+
+    @property
+    def sum(self) -> Union[int, float]:
+        return self._sum
+
+    @property
+    def mean(self) -> float:
+        if not self._len:
+            raise ValueError("mean of an empty RingBuffer")
+        return self._sum / self._len
+
+    def view(self) -> np.ndarray:
+        """The values, oldest first, as a read-only view (no copy)."""
+        out = self._buf[self._head:self._head + self._len]
+        out.flags.writeable = False
+        return out
+
+    def __getitem__(self, i: int) -> Any:
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError("deque index out of range")
+        return self._cells[self._head + i]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.tolist())
+
+    def tolist(self) -> List[Any]:
+        return self.view().tolist()
+
+    def __repr__(self) -> str:
+        return f"RingBuffer({self.tolist()}, maxlen={self.maxlen})"
+
+
+def benchmark(n: int = 10_000_000, window: int = 1_000_000,
+              aggregate_steps: int = 1_000) -> None:
+    """
+    Append n floats one at a time and in chunks, then compute the window
+    mean after each of aggregate_steps appends. A single append is a C call
+    for deque but Python code here, so feed RingBuffer with extend where the
+    data arrives in batches; the gain is in the aggregates.
+    """
+    print(f"--- ring buffer benchmark: n={n:,}, window={window:,} ---")
+    values = np.random.default_rng(0).random(n)
+    items = values.tolist()
+    dq: deque = deque(maxlen=window)
+    rb = RingBuffer(window)
+    chunked = RingBuffer(window)
+
+    def append_deque():
+        append = dq.append
+        for x in items:
+            append(x)
+
+    def append_ring():
+        append = rb.append
+        for x in items:
+            append(x)
+
+    def extend_ring():
+        for start in range(0, n, 4096):
+            chunked.extend(values[start:start + 4096])
+
+    for name, fn in [("deque.append", append_deque),
+                     ("RingBuffer.append", append_ring),
+                     ("RingBuffer.extend (4096)", extend_ring)]:
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        print(f"{name:28s} {elapsed:8.3f}s  {n / elapsed:14,.0f} appends/s")
+    assert list(dq) == rb.tolist() == chunked.tolist()
+
+    def mean_deque():
+        for x in items[:aggregate_steps]:
+            dq.append(x)
+            sum(dq) / len(dq)
+
+    def mean_ring():
+        for x in items[:aggregate_steps]:
+            rb.append(x)
+            rb.mean
+
+    def mean_view():
+        for x in items[:aggregate_steps]:
+            chunked.append(x)
+            chunked.view().mean()
+
+    for name, fn in [("deque: sum(dq) / len(dq)", mean_deque),
+                     ("RingBuffer.mean", mean_ring),
+                     ("RingBuffer.view().mean()", mean_view)]:
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        print(f"{name:28s} {elapsed / aggregate_steps * 1e6:10.2f} us/update")
+    assert abs(rb.mean - np.mean(dq)) < 1e-9
+
+
+if __name__ == "__main__":
+    dq = RingBuffer(maxlen=3, dtype=np.int64, iterable=[1, 2, 3])
+    print("ring:", dq)
+    dq.appendleft(0)  # full: drops 3 from the right
+    print("ring after appendleft:", dq)
+    dq.append(4)  # full: drops 0 from the left
+    print("ring after append:", dq)
+    print("pop:", dq.pop(), "popleft:", dq.popleft(), "ring:", dq)
+    dq.extend([5, 6])
+    dq.rotate(1)
+    print("ring after rotate:", dq, "sum:", dq.sum, "mean:", dq.mean)
+    print("ordered view:", dq.view())
+    benchmark(n=2_000_000, window=100_000)
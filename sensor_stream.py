@@ -0,0 +1,265 @@
+"""sensor_stream.py
+
+Vectorized parser for flat (label, value, unit) telemetry streams.
+
+list_test.mixed_type_lists_benefits decodes a flat mixed_data list by
+stepping range(0, len(mixed_data), 3) and indexing three times per record.
+Here the same flat layout arrives as bytes, e.g.
+
+    temperature,25.5,Celsius,humidity,60,percent,...
+
+(commas and newlines both separate fields). The buffer is wrapped with
+np.frombuffer, separator positions are found in one vectorized pass, and
+the label / value / unit tokens are the strided views [0::3], [1::3] and
+[2::3] of the token boundaries. Tokens are read into fixed-width
+byte-string arrays through a sliding uint64 view of the buffer, so values
+convert to float64 and labels / units are dictionary-encoded with NumPy
+calls, without a Python object per record.
+
+Run this file to benchmark against the index-stepping loop.
+"""
+
+from typing import BinaryIO, Dict, Iterator, List, Tuple
+import io
+import random
+import time
+
+import numpy as np
+
+RECORD_DTYPE = np.dtype([("label", np.int32), ("value", np.float64),
+                         ("unit", np.int32)])
+SEPARATORS = (ord(","), ord("\n"))
+DEFAULT_CHUNK_BYTES = 1 << 22
+
+
+# _MASKS[i] keeps the low i bytes of a little-endian uint64 word.
+_MASKS = np.array([(1 << (8 * i)) - 1 for i in range(8)] + [(1 << 64) - 1],
+                  dtype=np.uint64)
+_WORD_TOKEN = 16  # tokens up to this many bytes take the two-word path
+_HASH_MULT = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _gather(buf: np.ndarray, starts: np.ndarray,
+            ends: np.ndarray) -> np.ndarray:
+    """Tokens buf[starts[i]:ends[i]] as a fixed-width bytes array."""
+    lengths = ends - starts
+    width = int(lengths.max()) if lengths.size else 1
+    idx = starts[:, None] + np.arange(width)
+    cells = buf[np.minimum(idx, len(buf) - 1)]
+    cells[np.arange(width) >= lengths[:, None]] = 0
+    return cells.view(f"S{width}").ravel()
+
+
+def _tokens(buf: np.ndarray, words: np.ndarray, starts: np.ndarray,
+            ends: np.ndarray) -> np.ndarray:
+    """
+    Tokens as a bytes array. Short tokens are read as two unaligned uint64
+    words from a sliding-window view of the buffer and masked to their
+    length, which is cheaper than gathering byte by byte.
+    """
+    lengths = ends - starts
+    if lengths.size and lengths.max() > _WORD_TOKEN:
+        return _gather(buf, starts, ends)
+    out = np.empty((len(starts), 2), dtype=np.uint64)
+    out[:, 0] = words[starts] & _MASKS[np.minimum(lengths, 8)]
+    out[:, 1] = words[starts + 8] & _MASKS[np.clip(lengths - 8, 0, 8)]
+    return out.view(f"S{_WORD_TOKEN}").ravel()
+
+
+def _unique(tokens: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """np.unique(tokens, return_inverse=True), hashing 16-byte tokens."""
+    if tokens.dtype.itemsize == _WORD_TOKEN and len(tokens):
+        w = tokens.view(np.uint64).reshape(-1, 2)
+        h = w[:, 0] * _HASH_MULT ^ w[:, 1]
+        _, first, inverse = np.unique(h, return_index=True,
+                                      return_inverse=True)
+        inverse = inverse.ravel()
+        if np.array_equal(w, w[first][inverse]):  # no hash collision
+            return tokens[first], inverse
+    uniq, inverse = np.unique(tokens, return_inverse=True)
+    return uniq, inverse.ravel()
+
+
+class SensorParser:
+    """
+    Parses flat triples into RECORD_DTYPE arrays. label and unit hold codes
+    into self.labels / self.units, which stay stable across chunks.
+    """
+
+    def __init__(self):
+        self.labels: List[str] = []
+        self.units: List[str] = []
+        self._label_codes: Dict[bytes, int] = {}
+        self._unit_codes: Dict[bytes, int] = {}
+
+    @staticmethod
+    def _encode(tokens: np.ndarray, table: Dict[bytes, int],
+                names: List[str]) -> np.ndarray:
+        uniq, inverse = _unique(tokens)
+        # Only the distinct values go through Python.
+        codes = np.empty(len(uniq), dtype=np.int32)
+        for i, u in enumerate(uniq.tolist()):
+            code = table.get(u)
+            if code is None:
+                code = table[u] = len(names)
+                names.append(u.decode())
+            codes[i] = code
+        return codes[inverse]
+
+    def parse(self, data, terminated: bool = False) -> np.ndarray:
+        """
+        Parse a complete buffer (bytes, bytearray or memoryview) holding a
+        whole number of triples. A trailing separator is allowed and ends
+        the last field; with terminated=True it is required, so e.g. an
+        empty last field is never mistaken for it.
+        """
+        buf = np.frombuffer(data, dtype=np.uint8)
+        seps = np.flatnonzero((buf == SEPARATORS[0]) | (buf == SEPARATORS[1]))
+        has_end = bool(len(seps)) and seps[-1] == len(buf) - 1
+        if terminated and len(buf) and not has_end:
+            raise ValueError("buffer does not end with a separator")
+        if len(buf) == 0 or (len(buf) == 1 and has_end):
+            return np.empty(0, dtype=RECORD_DTYPE)
+        # One zero-padded copy so every token start has two full words
+        # after it; words is a zero-copy view with a stride of one byte.
+        padded = np.zeros(len(buf) + 2 * _WORD_TOKEN, dtype=np.uint8)
+        padded[:len(buf)] = buf
+        words = np.ndarray(shape=(len(padded) - 7,), dtype="<u8",
+                           buffer=padded, strides=(1,))
+        if not has_end:
+            seps = np.append(seps, len(buf))  # last token has no separator
+        starts = np.concatenate(([0], seps[:-1] + 1)).astype(np.intp)
+        ends = seps.astype(np.intp)
+        if len(starts) % 3:
+            raise ValueError(f"{len(starts)} fields is not a whole number "
+                             "of (label, value, unit) triples")
+        out = np.empty(len(starts) // 3, dtype=RECORD_DTYPE)
+        if len(out) == 0:
+            return out
+        out["label"] = self._encode(
+            _tokens(padded, words, starts[0::3], ends[0::3]),
+            self._label_codes, self.labels)
+        out["value"] = _tokens(padded, words, starts[1::3],
+                               ends[1::3]).astype(np.float64)
+        out["unit"] = self._encode(
+            _tokens(padded, words, starts[2::3], ends[2::3]),
+            self._unit_codes, self.units)
+        return out
+
+    def iter_stream(self, stream: BinaryIO,
+                    chunk_bytes: int = DEFAULT_CHUNK_BYTES
+                    ) -> Iterator[np.ndarray]:
+        """
+        Read a file or socket-like object (anything with readinto, e.g.
+        socket.makefile('rb')) in chunks and yield one record array per
+        chunk. Bytes after the last complete triple carry over.
+        """
+        block = bytearray(chunk_bytes)
+        view = memoryview(block)
+        carry = b""
+        while True:
+            n = stream.readinto(view)
+            if not n:
+                break
+            data = carry + view[:n]
+            buf = np.frombuffer(data, dtype=np.uint8)
+            seps = np.flatnonzero((buf == SEPARATORS[0])
+                                  | (buf == SEPARATORS[1]))
+            complete = len(seps) // 3 * 3
+            if complete == 0:
+                carry = data
+                continue
+            cut = int(seps[complete - 1]) + 1
+            carry = data[cut:]
+            yield self.parse(memoryview(data)[:cut], terminated=True)
+        if carry.strip(b",\n"):
+            yield self.parse(carry)
+
+    def read(self, stream: BinaryIO,
+             chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> np.ndarray:
+        parts = list(self.iter_stream(stream, chunk_bytes))
+        return np.concatenate(parts) if parts else np.empty(0, RECORD_DTYPE)
+
+
+def aggregate(records: np.ndarray) -> np.ndarray:
+    """
+    Group records by label: count, sum, mean, min and max of value, in
+    label code order.
+    """
+    labels = records["label"]
+    values = records["value"]
+    n = int(labels.max()) + 1 if len(labels) else 0
+    count = np.bincount(labels, minlength=n)
+    total = np.bincount(labels, weights=values, minlength=n)
+    lo = np.full(n, np.inf)
+    hi = np.full(n, -np.inf)
+    np.minimum.at(lo, labels, values)
+    np.maximum.at(hi, labels, values)
+    out = np.empty(n, dtype=[("label", np.int32), ("count", np.int64),
+                             ("sum", np.float64), ("mean", np.float64),
+                             ("min", np.float64), ("max", np.float64)])
+    out["label"] = np.arange(n)
+    out["count"] = count
+    out["sum"] = total
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out["mean"] = total / count
+    out["min"] = lo
+    out["max"] = hi
+    return out
+
+
+def _stepping_loop(mixed_data: list) -> List[Tuple[str, float, str]]:
+    out = []
+    for i in range(0, len(mixed_data), 3):
+        label = mixed_data[i]
+        value = mixed_data[i + 1]
+        unit = mixed_data[i + 2]
+        out.append((label, value, unit))
+    return out
+
+
+def _split_and_step(data: bytes) -> List[Tuple[str, float, str]]:
+    fields = data.decode().replace("\n", ",").rstrip(",").split(",")
+    return [(fields[i], float(fields[i + 1]), fields[i + 2])
+            for i in range(0, len(fields), 3)]
+
+
+def benchmark(n: int = 5_000_000, seed: int = 0) -> None:
+    print(f"--- sensor stream benchmark: {n} records ---")
+    rng = random.Random(seed)
+    kinds = [("temperature", "Celsius"), ("humidity", "percent"),
+             ("pressure", "hPa"), ("wind_speed", "km/h")]
+    mixed_data = []
+    for _ in range(n):
+        label, unit = rng.choice(kinds)
+        mixed_data += [label, round(rng.uniform(0, 1100), 2), unit]
+    data = ("\n".join(f"{mixed_data[i]},{mixed_data[i + 1]},{mixed_data[i + 2]}"
+                      for i in range(0, len(mixed_data), 3)) + "\n").encode()
+    rows = [
+        ("stepping loop (list)", lambda: _stepping_loop(mixed_data)),
+        ("split + stepping (bytes)", lambda: _split_and_step(data)),
+        ("SensorParser.parse", lambda: SensorParser().parse(data)),
+        ("SensorParser stream",
+         lambda: SensorParser().read(io.BytesIO(data))),
+        ("parse + aggregate", lambda: aggregate(SensorParser().parse(data))),
+    ]
+    for name, fn in rows:
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        print(f"{name:26s} {elapsed:8.3f}s  {n / elapsed:14,.0f} records/s")
+
+
+if __name__ == "__main__":
+    stream = io.BytesIO(b"temperature,25.5,Celsius,humidity,60,percent,"
+                        b"pressure,1013.25,hPa,wind_speed,15.2,km/h\n"
+                        b"temperature,27.5,Celsius\n")
+    parser = SensorParser()
+    records = parser.read(stream, chunk_bytes=16)
+    for r in records:
+        print(f"  {parser.labels[r['label']]}: {r['value']} "
+              f"{parser.units[r['unit']]}")
+    for g in aggregate(records):
+        print(f"  {parser.labels[g['label']]}: count={g['count']} "
+              f"mean={g['mean']:.2f}")
+    benchmark(n=1_000_000)
@@ -0,0 +1,282 @@
+"""sorted_dict.py
+
+A dict that keeps its keys sorted as it is updated.
+
+sorting.sort_dict returns sorted(d.items(), key=lambda x: x[0]): every call
+sorts all n keys again, O(n log n), even when only a few keys changed since
+the last call. SortedDict stores the values in a plain dict and the keys in
+a chunked sorted list: a list of sorted sublists of at most 2 * LOAD keys,
+plus the largest key of each sublist, with the (key, value) tuples kept in
+a parallel layout. An insert or delete bisects the maxima to find the
+sublist (O(log n)) and then the sublist (a memmove of at most 2 * LOAD
+pointers); ordered iteration just walks the sublists, and a key range is
+two bisections followed by O(k) iteration.
+
+items() returns the same List[(k, v)] as sort_dict, and sort_dict returns it
+directly when given a SortedDict.
+
+Run this file to benchmark update + ordered read against re-sorting.
+"""
+
+from bisect import bisect_left, bisect_right
+from itertools import chain
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+import random
+import time
+
+LOAD = 1000
+
+
+class SortedDict:
+    """Mapping with keys kept in ascending order."""
+
+    def __init__(self, items: Any = ()):
+        self._data: Dict[Hashable, Any] = {}
+        pairs = items.items() if hasattr(items, "items") else items
+        self._data.update(pairs)
+        ordered = sorted(self._data.items(), key=lambda x: x[0])
+        # _pairs mirrors _lists with the (key, value) tuples, so ordered
+        # reads copy pointers instead of building a tuple per item.
+        self._pairs = [ordered[i:i + LOAD] for i in range(0, len(ordered), LOAD)]
+        self._lists = [[k for k, _ in sub] for sub in self._pairs]
+        self._maxes = [sub[-1] for sub in self._lists]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._data
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._data[key]
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        return self._data.get(key, default)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        if key in self._data:
+            i, j = self._locate(key)
+            # Keep the stored key, like dict does for an equal key (1 / 1.0).
+            self._pairs[i][j] = (self._lists[i][j], value)
+        else:
+            self._insert(key, value)
+        self._data[key] = value
+
+    def __delitem__(self, key: Any) -> None:
+        del self._data[key]
+        self._remove(key)
+
+    def pop(self, key: Any, *default: Any) -> Any:
+        if key not in self._data:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        value = self._data.pop(key)
+        self._remove(key)
+        return value
+
+    def _locate(self, key: Any) -> Tuple[int, int]:
+        """Sublist and position of a key that is present."""
+        i = bisect_left(self._maxes, key)
+        return i, bisect_left(self._lists[i], key)
+
+    def _split(self, i: int, at: int) -> None:
+        sub, pairs = self._lists[i], self._pairs[i]
+        self._lists[i:i + 1] = [sub[:at], sub[at:]]
+        self._pairs[i:i + 1] = [pairs[:at], pairs[at:]]
+        self._maxes[i:i + 1] = [sub[at - 1], sub[-1]]
+
+    def _insert(self, key: Any, value: Any) -> None:
+        maxes = self._maxes
+        if not maxes:
+            self._lists.append([key])
+            self._pairs.append([(key, value)])
+            maxes.append(key)
+            return
+        i = bisect_left(maxes, key)
+        if i == len(maxes):  # beyond the current maximum
+            i -= 1
+            self._lists[i].append(key)
+            self._pairs[i].append((key, value))
+            maxes[i] = key
+        else:
+            j = bisect_left(self._lists[i], key)
+            self._lists[i].insert(j, key)
+            self._pairs[i].insert(j, (key, value))
+        if len(self._lists[i]) > 2 * LOAD:
+            self._split(i, LOAD)
+
+    def _remove(self, key: Any) -> None:
+        i, j = self._locate(key)
+        sub = self._lists[i]
+        del sub[j]
+        del self._pairs[i][j]
+        if not sub:
+            del self._lists[i]
+            del self._pairs[i]
+            del self._maxes[i]
+            return
+        self._maxes[i] = sub[-1]
+        # Merge small neighbours so the number of sublists stays O(n / LOAD).
+        if len(sub) < LOAD // 2 and len(self._lists) > 1:
+            j = i if i + 1 < len(self._lists) else i - 1
+            self._lists[j:j + 2] = [self._lists[j] + self._lists[j + 1]]
+            self._pairs[j:j + 2] = [self._pairs[j] + self._pairs[j + 1]]
+            self._maxes[j:j + 2] = [self._maxes[j + 1]]
+            if len(self._lists[j]) > 2 * LOAD:
+                self._split(j, len(self._lists[j]) // 2)
+
+    def __iter__(self) -> Iterator[Any]:
+        for sub in self._lists:
+            yield from sub
+
+    def keys(self) -> List[Any]:
+        return list(chain.from_iterable(self._lists))
+
+    def values(self) -> List[Any]:
+        return [value for sub in self._pairs for _, value in sub]
+
+    def items(self) -> List[Tuple[Any, Any]]:
+        """(key, value) pairs in key order, like sorting.sort_dict."""
+        return list(chain.from_iterable(self._pairs))
+
+    def irange(self, lo: Optional[Any] = None, hi: Optional[Any] = None,
+               inclusive: Tuple[bool, bool] = (True, True)) -> Iterator[Any]:
+        """Keys k with lo <= k <= hi (None means unbounded), in order."""
+        lists, maxes = self._lists, self._maxes
+        if not maxes:
+            return
+        if lo is None:
+            i, j = 0, 0
+        else:
+            i = (bisect_left if inclusive[0] else bisect_right)(maxes, lo)
+            if i == len(maxes):
+                return
+            j = (bisect_left if inclusive[0] else bisect_right)(lists[i], lo)
+        for sub in lists[i:]:
+            if hi is not None and sub[-1] > hi or (
+                    hi is not None and not inclusive[1] and sub[-1] == hi):
+                end = (bisect_right if inclusive[1] else bisect_left)(sub, hi)
+                yield from sub[j:end]
+                return
+            yield from sub[j:]
+            j = 0
+
+    def items_range(self, lo: Optional[Any] = None, hi: Optional[Any] = None,
+                    inclusive: Tuple[bool, bool] = (True, True)
+                    ) -> List[Tuple[Any, Any]]:
+        data = self._data
+        return [(key, data[key]) for key in self.irange(lo, hi, inclusive)]
+
+    def islice(self, start: int = 0, stop: Optional[int] = None
+               ) -> List[Tuple[Any, Any]]:
+        """Items by position, like items()[start:stop] without building all."""
+        start, stop, _ = slice(start, stop).indices(len(self))
+        out: List[Tuple[Any, Any]] = []
+        pos = 0
+        for sub in self._pairs:
+            if pos >= stop:
+                break
+            end = pos + len(sub)
+            if end > start:
+                out.extend(sub[max(start - pos, 0):stop - pos])
+            pos = end
+        return out
+
+    def peekitem(self, index: int = -1) -> Tuple[Any, Any]:
+        """The item at a position; -1 is the largest key."""
+        if not self._data:
+            raise IndexError("peekitem on empty SortedDict")
+        if index < 0:
+            index += len(self)
+        item = self.islice(index, index + 1)
+        if not item:
+            raise IndexError("SortedDict index out of range")
+        return item[0]
+
+    def __repr__(self) -> str:
+        return f"SortedDict({self.items()!r})"
+
+
+def _resort_workload(d: Dict[int, int], ops: List[Tuple[int, int]],
+                     reads: int) -> Any:
+    every = max(1, len(ops) // reads)
+    result = None
+    for n, (key, value) in enumerate(ops, 1):
+        if value < 0:
+            d.pop(key, None)
+        else:
+            d[key] = value
+        if n % every == 0:
+            result = sorted(d.items(), key=lambda x: x[0])
+    return result
+
+
+def _sorted_dict_workload(d: SortedDict, ops: List[Tuple[int, int]],
+                          reads: int) -> Any:
+    every = max(1, len(ops) // reads)
+    result = None
+    for n, (key, value) in enumerate(ops, 1):
+        if value < 0:
+            d.pop(key, None)
+        else:
+            d[key] = value
+        if n % every == 0:
+            result = d.items()
+    return result
+
+
+def benchmark(n: int = 1_000_000, updates: int = 100_000, reads: int = 100,
+              window: int = 100, seed: int = 0) -> None:
+    """
+    Start from n keys, apply updates (a fifth of them deletes) and read the
+    full ordered items reads times; then time range queries of window keys.
+    """
+    print(f"--- sorted dict benchmark: {n:,} keys, {updates:,} updates, "
+          f"{reads} ordered reads ---")
+    rng = random.Random(seed)
+    universe = 4 * n
+    base = {rng.randrange(universe): i for i in range(n)}
+    ops = [(rng.randrange(universe),
+            -1 if rng.random() < 0.2 else rng.randrange(1000))
+           for _ in range(updates)]
+    start = time.perf_counter()
+    sd = SortedDict(base)
+    print(f"{'SortedDict build':30s} {time.perf_counter() - start:8.3f}s")
+    rows = [("dict + sorted() per read",
+             lambda: _resort_workload(dict(base), ops, reads)),
+            ("SortedDict", lambda: _sorted_dict_workload(sd, ops, reads))]
+    results = []
+    for name, fn in rows:
+        start = time.perf_counter()
+        results.append(fn())
+        print(f"{name:30s} {time.perf_counter() - start:8.3f}s")
+    assert results[0] == results[1]
+
+    los = [rng.randrange(universe) for _ in range(reads)]
+    span = universe // len(sd) * window
+    plain = dict(sd.items())
+    for name, fn in [
+        ("range: sort + filter", lambda lo: [
+            kv for kv in sorted(plain.items(), key=lambda x: x[0])
+            if lo <= kv[0] <= lo + span]),
+        ("range: SortedDict.items_range",
+         lambda lo: sd.items_range(lo, lo + span)),
+    ]:
+        start = time.perf_counter()
+        for lo in los:
+            fn(lo)
+        elapsed = time.perf_counter() - start
+        print(f"{name:30s} {elapsed / reads * 1e3:8.3f} ms/query")
+
+
+if __name__ == "__main__":
+    from sorting import sort_dict
+
+    d = SortedDict({3: 6, 1: 4, 2: 9})
+    d[0] = 1
+    del d[2]
+    print("sort_dict(SortedDict):", sort_dict(d))
+    print("keys in [1, 3]:", list(d.irange(1, 3)))
+    print("largest:", d.peekitem())
+    benchmark(n=200_000, updates=50_000)
@@ -1,13 +1,29 @@
 import heapq
-from typing import List, Set, Dict
+from typing import Iterable, Iterator, List, Optional, Set, Dict, Union
+
+from external_sort import external_sort
+from int_sort import sort_ints
+from sorted_dict import SortedDict
 
 def sort_list(lst: List[int]) -> List[int]:
-    return sorted(lst)
+    return sort_ints(lst)
+
+def sort_list_external(source: Union[str, Iterable[int]],
+                       run_size: Optional[int] = None,
+                       memory_budget: Optional[int] = None) -> Iterator[int]:
+    """
+    Out-of-core version of sort_list for inputs larger than RAM.
+    source is an iterable of ints or a path to a file of integers; results
+    are yielded lazily in ascending order.
+    """
+    return external_sort(source, run_size=run_size, memory_budget=memory_budget)
 
 def sort_set(s: Set[int]) -> List[int]:
-    return sorted(s)
+    return sort_ints(s, unique=True)
 
-def sort_dict(d: Dict[int, int]) -> List[int]:
+def sort_dict(d: Union[Dict[int, int], SortedDict]) -> List[int]:
+    if isinstance(d, SortedDict):
+        return d.items()  # already in key order, no re-sort
     return sorted(d.items(), key=lambda x: x[0])
 
 def sort_interval():
@@ -0,0 +1,280 @@
+"""streaming_stats.py
+
+Single-pass, mergeable summary statistics.
+
+list_test.practical_real_world_examples computes sum, len, average, max, min
+and the above-average days with several full passes over sales_data and
+over each student's grades. RunningStats gets count, sum, mean, variance
+(Welford), min, max and approximate quantiles in one pass over an unbounded
+iterator or a NumPy array (summarize), folding chunks in with vectorized
+reductions (update_array); update adds a single value. Two RunningStats
+merge exactly (Chan et al.), so workers can summarize their share of the
+data independently.
+
+Quantiles come from a uniform reservoir sample of at most sample_size
+values, which also merges exactly. The above-average filter then needs one
+extra pass over the data (above), or none when an estimate is enough
+(estimate_above).
+
+GroupedStats keeps one RunningStats per key, e.g. per student.
+
+Run this file to benchmark against the multi-pass code.
+"""
+
+from itertools import islice
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+import math
+import random
+import time
+
+import numpy as np
+
+DEFAULT_SAMPLE_SIZE = 4096
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+class RunningStats:
+    """count, sum, mean, variance, min, max and a reservoir sample."""
+
+    def __init__(self, sample_size: int = DEFAULT_SAMPLE_SIZE,
+                 seed: Optional[int] = None):
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self._m2 = 0.0  # sum of squared deviations from the mean
+        self.min = math.inf
+        self.max = -math.inf
+        self.sample_size = sample_size
+        self.sample: List[float] = []
+        self._rng = random.Random(seed)
+
+    def update(self, x: float) -> None:
+        self.count += 1
+        self.total += x
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+        # Reservoir sampling (Algorithm R).
+        if len(self.sample) < self.sample_size:
+            self.sample.append(x)
+        else:
+            j = self._rng.randrange(self.count)
+            if j < self.sample_size:
+                self.sample[j] = x
+
+    def extend(self, values: Iterable[float]) -> "RunningStats":
+        for x in values:
+            self.update(x)
+        return self
+
+    def update_array(self, chunk: np.ndarray) -> "RunningStats":
+        """Fold a whole chunk in with vectorized reductions."""
+        chunk = np.asarray(chunk, dtype=np.float64).ravel()
+        if chunk.size == 0:
+            return self
+        part = RunningStats(self.sample_size, self._rng.randrange(1 << 32))
+        part.count = int(chunk.size)
+        part.total = float(chunk.sum())
+        part.mean = part.total / part.count
+        part._m2 = float(((chunk - part.mean) ** 2).sum())
+        part.min = float(chunk.min())
+        part.max = float(chunk.max())
+        if chunk.size <= self.sample_size:
+            part.sample = chunk.tolist()
+        else:
+            rng = np.random.default_rng(self._rng.randrange(1 << 32))
+            part.sample = rng.choice(chunk, self.sample_size,
+                                     replace=False).tolist()
+        return self.merge(part)
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """Combine other into self as if self had seen other's values too."""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            sample = list(other.sample)
+        else:
+            sample = self._merge_samples(other)
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / n
+        self.mean += delta * other.count / n
+        self.count = n
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sample = sample
+        return self
+
+    def _merge_samples(self, other: "RunningStats") -> List[float]:
+        """A uniform sample of the union of both streams."""
+        k = min(self.sample_size, self.count + other.count)
+        rng = np.random.default_rng(self._rng.randrange(1 << 32))
+        # How many of k draws without replacement come from self's stream.
+        from_self = int(rng.hypergeometric(self.count, other.count, k))
+        return (self._rng.sample(self.sample, from_self)
+                + self._rng.sample(other.sample, k - from_self))
+
+    @property
+    def variance(self) -> float:
+        """Population variance (statistics.pvariance)."""
+        return self._m2 / self.count if self.count else math.nan
+
+    @property
+    def sample_variance(self) -> float:
+        """Sample variance (statistics.variance)."""
+        return self._m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+    def quantile(self, q: float) -> float:
+        """Approximate q-quantile; exact while count <= sample_size."""
+        if not self.sample:
+            return math.nan
+        return float(np.quantile(self.sample, q))
+
+    def estimate_above(self, threshold: float) -> float:
+        """Approximate number of values > threshold, from the sample."""
+        if not self.sample:
+            return 0.0
+        above = sum(1 for x in self.sample if x > threshold)
+        return above * self.count / len(self.sample)
+
+    def __repr__(self) -> str:
+        return (f"RunningStats(count={self.count}, mean={self.mean:.4g}, "
+                f"stdev={self.stdev:.4g}, min={self.min}, max={self.max})")
+
+
+def summarize(values: Iterable[float],
+              chunk_size: int = DEFAULT_CHUNK_SIZE) -> RunningStats:
+    """
+    One pass over values, folded in chunk_size pieces. An iterator is
+    buffered chunk by chunk, so memory stays bounded for unbounded streams
+    while the per-value work is vectorized.
+    """
+    stats = RunningStats()
+    if isinstance(values, np.ndarray):
+        flat = values.ravel()
+        for start in range(0, flat.size, chunk_size):
+            stats.update_array(flat[start:start + chunk_size])
+        return stats
+    it = iter(values)
+    while True:
+        chunk = np.fromiter(islice(it, chunk_size), dtype=np.float64)
+        if chunk.size == 0:
+            return stats
+        stats.update_array(chunk)
+
+
+def above(values: Iterable[float], threshold: float) -> Iterator[float]:
+    """The one extra pass for filters like 'days above average'."""
+    if isinstance(values, np.ndarray):
+        return iter(values[values > threshold])
+    return (x for x in values if x > threshold)
+
+
+class GroupedStats:
+    """One RunningStats per key."""
+
+    def __init__(self, sample_size: int = DEFAULT_SAMPLE_SIZE):
+        self.sample_size = sample_size
+        self.groups: Dict[Hashable, RunningStats] = {}
+
+    def _group(self, key: Hashable) -> RunningStats:
+        stats = self.groups.get(key)
+        if stats is None:
+            stats = self.groups[key] = RunningStats(self.sample_size)
+        return stats
+
+    def update(self, key: Hashable, value: float) -> None:
+        self._group(key).update(value)
+
+    def update_many(self, pairs: Iterable[Tuple[Hashable, float]]) -> None:
+        for key, value in pairs:
+            self._group(key).update(value)
+
+    def update_arrays(self, keys: np.ndarray, values: np.ndarray) -> None:
+        """Group a chunk by key with one sort, then fold each group in."""
+        keys = np.asarray(keys)
+        values = np.asarray(values, dtype=np.float64)
+        order = np.argsort(keys, kind="stable")
+        uniq, starts = np.unique(keys[order], return_index=True)
+        for key, part in zip(uniq.tolist(), np.split(values[order], starts[1:])):
+            self._group(key).update_array(part)
+
+    def merge(self, other: "GroupedStats") -> "GroupedStats":
+        for key, stats in other.groups.items():
+            self._group(key).merge(stats)
+        return self
+
+    def __getitem__(self, key: Hashable) -> RunningStats:
+        return self.groups[key]
+
+    def items(self):
+        return self.groups.items()
+
+
+def _multi_pass(sales_data: List[float]) -> Tuple:
+    total_sales = sum(sales_data)
+    avg_sales = total_sales / len(sales_data)
+    above_average = [x for x in sales_data if x > avg_sales]
+    return total_sales, avg_sales, max(sales_data), min(sales_data), \
+        len(above_average)
+
+
+def _single_pass(data) -> Tuple:
+    stats = summarize(data)
+    n_above = sum(1 for _ in above(data, stats.mean))
+    return stats.total, stats.mean, stats.max, stats.min, n_above
+
+
+class _Reiterable:
+    """An iterable (not a list) that can be walked twice, like a re-read file."""
+
+    def __init__(self, values: List[float]):
+        self.values = values
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self.values)
+
+
+def benchmark(n: int = 10_000_000, seed: int = 0) -> None:
+    print(f"--- streaming stats benchmark: {n} values ---")
+    arr = np.random.default_rng(seed).integers(100, 250, size=n).astype(float)
+    values = arr.tolist()
+    rows = [
+        ("multi-pass (list)", lambda: _multi_pass(values)),
+        ("RunningStats (iterator)", lambda: _single_pass(_Reiterable(values))),
+        ("RunningStats (ndarray)", lambda: _single_pass(arr)),
+        ("RunningStats (estimate)",
+         lambda: summarize(arr).estimate_above(arr.mean())),
+    ]
+    for name, fn in rows:
+        start = time.perf_counter()
+        fn()
+        print(f"{name:26s} {time.perf_counter() - start:8.3f}s")
+
+
+if __name__ == "__main__":
+    sales_data = [120, 150, 180, 200, 160, 140, 190, 210, 170, 130]
+    stats = summarize(sales_data)
+    print(f"Total sales: {stats.total}")
+    print(f"Average sales: {stats.mean:.2f}")
+    print(f"Days above average: {list(above(sales_data, stats.mean))}")
+    print(f"Median sales: {stats.quantile(0.5)}, stdev {stats.stdev:.2f}")
+    student_grades = {
+        'Alice': [85, 90, 78, 92],
+        'Bob': [88, 76, 95, 89],
+        'Charlie': [92, 88, 90, 85]
+    }
+    grades = GroupedStats()
+    grades.update_many((s, g) for s, gs in student_grades.items() for g in gs)
+    for student, s in grades.items():
+        print(f"{student}: Avg={s.mean:.1f}, Max={s.max}, Min={s.min}")
+    benchmark(n=2_000_000)
@@ -0,0 +1,218 @@
+"""top_k.py
+
+Bounded top-k selection over an unbounded stream.
+
+sorting.sort_heapq, data_structure.test_heapq and iteration.heapq_test push
+every item into a heap and pop them all out: a full O(n log n) sort with
+O(n) memory. TopK keeps only the k best items seen so far. Once the heap is
+full, a new item is compared with the root and, only if it is better,
+replaces the root with heapreplace (the same step as heappushpop), so the
+cost is O(n log k) time and O(k) memory.
+
+Max-heaps (k smallest) use heapq.heapify_max / heapreplace_max where they
+exist (Python 3.14+) and small local equivalents before that, so items are
+never negated. With a key function only the items that make it
+into the heap are wrapped as (key, seq, item).
+
+Run this file for a demo and a benchmark against push-all/pop-all.
+"""
+
+from itertools import count
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import heapq
+import random
+import time
+
+
+def _siftdown_max(heap: List[Any], startpos: int, pos: int) -> None:
+    """Move heap[pos] up towards startpos until its parent is not smaller."""
+    newitem = heap[pos]
+    while pos > startpos:
+        parentpos = (pos - 1) >> 1
+        parent = heap[parentpos]
+        if not parent < newitem:
+            break
+        heap[pos] = parent
+        pos = parentpos
+    heap[pos] = newitem
+
+
+def _siftup_max(heap: List[Any], pos: int) -> None:
+    """heapq's sift: move the larger child up to a leaf, then sift back."""
+    endpos = len(heap)
+    startpos = pos
+    newitem = heap[pos]
+    childpos = 2 * pos + 1
+    while childpos < endpos:
+        rightpos = childpos + 1
+        if rightpos < endpos and not heap[rightpos] < heap[childpos]:
+            childpos = rightpos
+        heap[pos] = heap[childpos]
+        pos = childpos
+        childpos = 2 * pos + 1
+    heap[pos] = newitem
+    _siftdown_max(heap, startpos, pos)
+
+
+def _local_heapify_max(heap: List[Any]) -> None:
+    for i in reversed(range(len(heap) // 2)):
+        _siftup_max(heap, i)
+
+
+def _local_heapreplace_max(heap: List[Any], item: Any) -> Any:
+    returnitem = heap[0]
+    heap[0] = item
+    _siftup_max(heap, 0)
+    return returnitem
+
+
+# Public (and in C) from Python 3.14.
+_heapify_max = getattr(heapq, "heapify_max", _local_heapify_max)
+_heapreplace_max = getattr(heapq, "heapreplace_max", _local_heapreplace_max)
+
+
+class TopK:
+    """
+    Keep the k largest (or, with largest=False, the k smallest) items of a
+    stream. Ties keep the item that arrived first, like
+    sorted(items, key=key, reverse=largest)[:k].
+    """
+
+    def __init__(self, k: int, key: Optional[Callable[[Any], Any]] = None,
+                 largest: bool = True):
+        if k < 0:
+            raise ValueError("k must be non-negative")
+        self.k = k
+        self.key = key
+        self.largest = largest
+        self._heap: List[Any] = []
+        self._seq = count()
+        # Root of a min-heap is the worst of the k largest and vice versa.
+        self._heapify = heapq.heapify if largest else _heapify_max
+        self._replace = heapq.heapreplace if largest else _heapreplace_max
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def _entry(self, item: Any) -> Any:
+        if self.key is None:
+            return item
+        # seq breaks key ties without comparing items; later items sort as
+        # "worse" so the earlier one is kept.
+        seq = next(self._seq)
+        return (self.key(item), -seq if self.largest else seq, item)
+
+    def _better(self, a: Any, b: Any) -> bool:
+        return a > b if self.largest else a < b
+
+    def push(self, item: Any) -> None:
+        heap = self._heap
+        if len(heap) < self.k:
+            heap.append(self._entry(item))
+            if len(heap) == self.k:
+                self._heapify(heap)
+            return
+        if not heap:  # k == 0
+            return
+        root = heap[0] if self.key is None else heap[0][0]
+        value = item if self.key is None else self.key(item)
+        if self._better(value, root):
+            self._replace(heap, self._entry(item))
+
+    def extend(self, items: Iterable[Any]) -> None:
+        """Push every item; the steady-state loop avoids method calls."""
+        it = iter(items)
+        heap = self._heap
+        if len(heap) < self.k:
+            for item in it:
+                self.push(item)
+                if len(heap) == self.k:
+                    break
+        if not heap or len(heap) < self.k:
+            return
+        replace, key, largest = self._replace, self.key, self.largest
+        if key is None:
+            root = heap[0]
+            for item in it:
+                if (item > root) if largest else (item < root):
+                    replace(heap, item)
+                    root = heap[0]
+            return
+        seq = self._seq
+        root = heap[0][0]
+        for item in it:
+            value = key(item)
+            if (value > root) if largest else (value < root):
+                n = next(seq)
+                replace(heap, (value, -n if largest else n, item))
+                root = heap[0][0]
+
+    def threshold(self) -> Any:
+        """The worst value still kept (the key value if key is set)."""
+        if not self._heap:
+            raise IndexError("threshold of empty TopK")
+        return self._heap[0] if self.key is None else self._heap[0][0]
+
+    def result(self) -> List[Any]:
+        """The kept items, best first."""
+        ordered = sorted(self._heap, reverse=self.largest)
+        if self.key is None:
+            return ordered
+        return [entry[2] for entry in ordered]
+
+
+def top_k(items: Iterable[Any], k: int,
+          key: Optional[Callable[[Any], Any]] = None,
+          largest: bool = True) -> List[Any]:
+    """Best k items of items, best first."""
+    tk = TopK(k, key=key, largest=largest)
+    tk.extend(items)
+    return tk.result()
+
+
+def top_k_by_value(d: Dict[Any, Any], k: int,
+                   largest: bool = True) -> List[Tuple[Any, Any]]:
+    """
+    The k (value, key) pairs of d with the best values, the pairs that
+    iteration.heapq_test pushes into its heap.
+    """
+    pairs = ((v, k_) for k_, v in d.items())
+    return top_k(pairs, k, key=itemgetter(0), largest=largest)
+
+
+def _push_all_pop_all(items: List[int], k: int) -> List[int]:
+    heap: List[int] = []
+    for n in items:
+        heapq.heappush(heap, -n)
+    return [-heapq.heappop(heap) for _ in range(min(k, len(heap)))]
+
+
+def benchmark(n: int = 10**7, k: int = 100, seed: int = 0) -> None:
+    print(f"--- top-k benchmark: k={k}, n={n} ---")
+    rng = random.Random(seed)
+    items = [rng.randrange(1 << 40) for _ in range(n)]
+    expected = sorted(items, reverse=True)[:k]
+    rows = [
+        ("push-all/pop-all", lambda: _push_all_pop_all(items, k)),
+        ("heapq.nlargest", lambda: heapq.nlargest(k, items)),
+        ("TopK", lambda: top_k(items, k)),
+        ("TopK (key, k smallest)", lambda: top_k(items, k, key=abs,
+                                                  largest=False)),
+    ]
+    for name, fn in rows:
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        if "smallest" not in name:
+            assert result == expected, name
+        print(f"{name:24s} {elapsed:8.3f}s  {n / elapsed:14,.0f} items/s")
+
+
+if __name__ == "__main__":
+    nums = [3, 1, 2, 6, 9, 8, 5]
+    print("3 largest:", top_k(nums, 3))
+    print("3 smallest:", top_k(nums, 3, largest=False))
+    hm = {3: 6, 5: 4, 7: 9}
+    print("2 smallest (value, key) pairs:", top_k_by_value(hm, 2, largest=False))
+    benchmark(n=10**6)
@@ -0,0 +1,267 @@
+"""transaction_log.py
+
+Append-only transaction log and balance snapshots for Account.
+
+Account.get_balance only knows running totals, so history cannot be audited
+or replayed. TransactionLog appends every open/deposit/withdraw as a
+fixed-size 17-byte binary record (account_id int64, kind uint8, amount
+float64); a partial record left at the end by a crash is truncated away
+when the log is reopened. Appends go into an in-memory buffer that is
+written out in bulk, and the log can be read back as a memory-mapped NumPy
+structured array.
+
+Balances are rebuilt by replaying records with vectorized group-by sums.
+write_snapshot stores the replayed balances together with the number of
+records they cover, so recover() only has to replay the log tail after the
+latest snapshot.
+
+Run this file to benchmark append throughput and recovery time.
+"""
+
+from dataclasses import dataclass
+from typing import Iterable, Optional, Tuple
+import os
+import struct
+import tempfile
+import time
+
+import numpy as np
+
+from oop import Account
+
+OPEN, DEPOSIT, WITHDRAW = 0, 1, 2
+RECORD = struct.Struct("<qBd")
+RECORD_DTYPE = np.dtype([("account_id", "<i8"), ("kind", "u1"),
+                         ("amount", "<f8")])  # packed, matches RECORD
+DEFAULT_BUFFER_BYTES = 1 << 20
+
+assert RECORD.size == RECORD_DTYPE.itemsize
+
+
+class TransactionLog:
+    """Append-only binary log of (account_id, kind, amount) records."""
+
+    def __init__(self, path: str, buffer_bytes: int = DEFAULT_BUFFER_BYTES):
+        self.path = path
+        self.buffer_bytes = buffer_bytes
+        self._file = open(path, "ab")
+        # A crash mid-write can leave a partial record at the end; drop it so
+        # new records start on a record boundary.
+        size = self._file.seek(0, os.SEEK_END)
+        if size % RECORD.size:
+            self._file.truncate(size - size % RECORD.size)
+        self._buf = bytearray()
+        self._flushed = size // RECORD.size
+
+    def __enter__(self) -> "TransactionLog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._flushed + len(self._buf) // RECORD.size
+
+    def append(self, account_id: int, kind: int, amount: float) -> None:
+        self._buf += RECORD.pack(account_id, kind, amount)
+        if len(self._buf) >= self.buffer_bytes:
+            self.flush()
+
+    def append_many(self, account_ids: Iterable[int], kinds: Iterable[int],
+                    amounts: Iterable[float]) -> None:
+        """Append a batch of records with one bulk conversion."""
+        ids = np.asarray(account_ids, dtype=np.int64)
+        records = np.empty(len(ids), dtype=RECORD_DTYPE)
+        records["account_id"] = ids
+        records["kind"] = kinds
+        records["amount"] = amounts
+        self._buf += records.tobytes()
+        if len(self._buf) >= self.buffer_bytes:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buf:
+            self._file.write(self._buf)
+            self._flushed += len(self._buf) // RECORD.size
+            self._buf = bytearray()
+        self._file.flush()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def read(self, start: int = 0, mmap: bool = True) -> np.ndarray:
+        """Flushed records from index start on, memory-mapped if mmap."""
+        self.flush()
+        return read_log(self.path, start, mmap)
+
+
+def read_log(path: str, start: int = 0, mmap: bool = True) -> np.ndarray:
+    n = os.path.getsize(path) // RECORD.size
+    if start >= n:
+        return np.empty(0, dtype=RECORD_DTYPE)
+    if mmap:
+        return np.memmap(path, dtype=RECORD_DTYPE, mode="r",
+                         offset=start * RECORD.size, shape=(n - start,))
+    with open(path, "rb") as f:
+        f.seek(start * RECORD.size)
+        return np.fromfile(f, dtype=RECORD_DTYPE, count=n - start)
+
+
+class LoggedAccount(Account):
+    """Account whose open/deposit/withdraw are also written to a log."""
+
+    def __init__(self, id, balance, log: TransactionLog):
+        super().__init__(id, balance)
+        self.log = log
+        log.append(id, OPEN, balance)
+
+    def deposit(self, amount):
+        super().deposit(amount)
+        self.log.append(self.id, DEPOSIT, amount)
+
+    def withdraw(self, amount):
+        super().withdraw(amount)
+        self.log.append(self.id, WITHDRAW, amount)
+
+
+@dataclass
+class Balances:
+    """Replayed state: Account fields as columns sorted by account id."""
+    ids: np.ndarray
+    balance: np.ndarray
+    deposit_amt: np.ndarray
+    payment_amt: np.ndarray
+    offset: int = 0  # number of log records folded into this state
+
+    @classmethod
+    def empty(cls) -> "Balances":
+        return cls(np.empty(0, np.int64), np.empty(0), np.empty(0),
+                   np.empty(0))
+
+    def get_balances(self) -> np.ndarray:
+        return self.balance + self.deposit_amt - self.payment_amt
+
+    def get_balance(self, account_id: int) -> float:
+        i = np.searchsorted(self.ids, account_id)
+        if i == len(self.ids) or self.ids[i] != account_id:
+            raise KeyError(account_id)
+        return (self.balance[i] + self.deposit_amt[i]
+                - self.payment_amt[i]).item()
+
+
+def replay(records: np.ndarray, state: Optional[Balances] = None) -> Balances:
+    """Fold records into state (or into an empty state) with group-by sums."""
+    if state is None:
+        state = Balances.empty()
+    ids, inv = np.unique(np.concatenate((state.ids, records["account_id"])),
+                         return_inverse=True)
+    n_old = len(state.ids)
+    old_rows, rec_rows = inv[:n_old], inv[n_old:]
+
+    def column(old: np.ndarray, kind: int) -> np.ndarray:
+        out = np.zeros(len(ids))
+        out[old_rows] = old
+        mask = records["kind"] == kind
+        out += np.bincount(rec_rows[mask], weights=records["amount"][mask],
+                           minlength=len(ids))
+        return out
+
+    return Balances(ids, column(state.balance, OPEN),
+                    column(state.deposit_amt, DEPOSIT),
+                    column(state.payment_amt, WITHDRAW),
+                    state.offset + len(records))
+
+
+def write_snapshot(path: str, state: Balances) -> None:
+    """Write state atomically (temp file + rename)."""
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.savez(f, ids=state.ids, balance=state.balance,
+                 deposit_amt=state.deposit_amt, payment_amt=state.payment_amt,
+                 offset=np.int64(state.offset))
+    os.replace(tmp, path)
+
+
+def read_snapshot(path: str) -> Balances:
+    with np.load(path) as z:
+        return Balances(z["ids"], z["balance"], z["deposit_amt"],
+                        z["payment_amt"], int(z["offset"]))
+
+
+def recover(log_path: str, snapshot_path: Optional[str] = None) -> Balances:
+    """Latest snapshot (if any) plus a replay of the log tail after it."""
+    state = None
+    if snapshot_path is not None and os.path.exists(snapshot_path):
+        state = read_snapshot(snapshot_path)
+    start = 0 if state is None else state.offset
+    return replay(read_log(log_path, start), state)
+
+
+def _timed(fn, *args) -> Tuple[float, object]:
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def benchmark(n_accounts: int = 100_000, n_records: int = 10_000_000,
+              tail_fraction: float = 0.05, seed: int = 0) -> None:
+    print(f"--- transaction log benchmark: {n_records} records ---")
+    rng = np.random.default_rng(seed)
+    ids = rng.integers(0, n_accounts, size=n_records - n_accounts)
+    kinds = rng.integers(DEPOSIT, WITHDRAW + 1, size=len(ids))
+    amounts = rng.integers(1, 100, size=len(ids)).astype(np.float64)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "tx.log")
+        snap_path = os.path.join(tmp, "snapshot.npz")
+
+        with TransactionLog(os.path.join(tmp, "calls.log")) as log:
+            accounts = [LoggedAccount(i, 100, log) for i in range(n_accounts)]
+            n_calls = min(len(ids), 1_000_000)
+            start = time.perf_counter()
+            for i, k, a in zip(ids[:n_calls].tolist(), kinds[:n_calls].tolist(),
+                               amounts[:n_calls].tolist()):
+                if k == DEPOSIT:
+                    accounts[i].deposit(a)
+                else:
+                    accounts[i].withdraw(a)
+            t_calls = time.perf_counter() - start
+        print(f"append via LoggedAccount {n_calls / t_calls:14,.0f} records/s")
+
+        with TransactionLog(log_path) as log:
+            start = time.perf_counter()
+            log.append_many(np.arange(n_accounts), np.full(n_accounts, OPEN),
+                            np.full(n_accounts, 100.0))
+            for s in range(0, len(ids), 1 << 16):
+                log.append_many(ids[s:s + (1 << 16)], kinds[s:s + (1 << 16)],
+                                amounts[s:s + (1 << 16)])
+            log.flush()
+            t_bulk = time.perf_counter() - start
+        print(f"append_many (bulk)       {n_records / t_bulk:14,.0f} records/s")
+
+        records = read_log(log_path)
+        cut = int(len(records) * (1 - tail_fraction))
+        write_snapshot(snap_path, replay(records[:cut]))
+        del records
+
+        t_full, full = _timed(recover, log_path)
+        t_snap, snap = _timed(recover, log_path, snap_path)
+        assert np.allclose(full.get_balances(), snap.get_balances())
+        print(f"recover, full replay     {t_full:8.3f}s")
+        print(f"recover, snapshot + {tail_fraction:.0%} tail {t_snap:8.3f}s")
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "tx.log")
+        with TransactionLog(log_path) as log:
+            account = LoggedAccount(1, 100, log)
+            account.deposit(50)
+            write_snapshot(os.path.join(tmp, "snap.npz"), replay(log.read()))
+            account.withdraw(30)
+        state = recover(log_path, os.path.join(tmp, "snap.npz"))
+        print("Account balance:", account.get_balance(),
+              "recovered:", state.get_balance(1))
+    benchmark(n_records=2_000_000)